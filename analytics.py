@@ -0,0 +1,103 @@
+from collections import deque
+
+ROLLING_WINDOW = 10
+CHART_POINTS = 200
+
+
+class QuizStats:
+    """Running quiz aggregates for one learner, updated one result at a time.
+
+    ``version`` changes whenever a result is added, so callers can cache
+    anything derived from the stats (such as a chart) against it.
+    """
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.count = 0
+        self.score_sum = 0.0
+        self.points = 0
+        self.by_day = {}
+        self.by_topic = {}
+        self.recent = deque(maxlen=window)
+        self.version = 0
+
+    @classmethod
+    def from_aggregates(cls, by_day, by_topic, recent_scores, window=ROLLING_WINDOW):
+        """Rebuild stats from stored totals: {day: (count, score_sum, points)}, {topic: (count, score_sum)}"""
+        stats = cls(window)
+        for day, (count, score_sum, points) in by_day.items():
+            stats.by_day[day] = [count, score_sum]
+            stats.count += count
+            stats.score_sum += score_sum
+            stats.points += points
+        stats.by_topic = {topic: [count, score_sum] for topic, (count, score_sum) in by_topic.items()}
+        stats.recent.extend(recent_scores)
+        return stats
+
+    def add(self, topic, score, points, day):
+        self.count += 1
+        self.score_sum += score
+        self.points += points
+        _accumulate(self.by_day, day, score)
+        _accumulate(self.by_topic, topic, score)
+        self.recent.append(score)
+        self.version += 1
+
+    @property
+    def average(self):
+        return self.score_sum / self.count if self.count else 0.0
+
+    @property
+    def rolling_average(self):
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    def daily_averages(self):
+        return {day: score_sum / count for day, (count, score_sum) in sorted(self.by_day.items())}
+
+    def category_averages(self, category_of):
+        """{category: (quizzes, average score)} folding topics through ``category_of``"""
+        totals = {}
+        for topic, (count, score_sum) in self.by_topic.items():
+            total = totals.setdefault(category_of(topic), [0, 0.0])
+            total[0] += count
+            total[1] += score_sum
+        return {category: (count, score_sum / count) for category, (count, score_sum) in totals.items()}
+
+
+def _accumulate(totals, key, score):
+    total = totals.get(key)
+    if total is None:
+        totals[key] = [1, score]
+    else:
+        total[0] += 1
+        total[1] += score
+
+
+def lttb(ys, threshold=CHART_POINTS):
+    """Indices of a Largest-Triangle-Three-Buckets downsample of ``ys``.
+
+    Points are taken as evenly spaced on x, which is how the quiz series is
+    drawn. Returns every index when the series is already short enough.
+    """
+    n = len(ys)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    keep = [0]
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        # Average of the next bucket is the third triangle vertex
+        avg_x = (end + next_end - 1) / 2
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+        ya = ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (ys[j] - ya) - (a - j) * (avg_y - ya))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    keep.append(n - 1)
+    return keep
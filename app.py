@@ -1,160 +1,165 @@
 import streamlit as st
+import os
 import random
-from datetime import datetime
-import plotly.express as px
-import requests
+import uuid
+from analytics import lttb
+from core import EduWiki
+from i18n import LANGUAGES, get_translations
+from metrics import ENABLED as METRICS_ENABLED, metrics, timed, timer
+from prefetch import Prefetcher
+from progress import ProgressStore
+from quiz import grade_quiz
 
 # Page config
 st.set_page_config(page_title="EduWiki Offline", page_icon="🎓", layout="wide")
+if METRICS_ENABLED:
+    metrics.begin_rerun()
 
-# CSS styling
-st.markdown("""
-<style>
-.main-header { background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%); padding: 1.5rem; border-radius: 15px; color: white; text-align: center; margin-bottom: 1rem;}
-.content-card { background: white; padding: 1.5rem; border-radius: 10px; box-shadow: 0 3px 15px rgba(0,0,0,0.1); margin: 0.5rem 0;}
-.level-badge { background: linear-gradient(45deg, #28a745, #20c997); color: white; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;}
-.wiki-card { background: #f8f9fa; padding: 1rem; border-radius: 8px; border-left: 4px solid #007bff; margin: 1rem 0;}
-</style>
-""", unsafe_allow_html=True)
+# CSS styling, read from static/ once per process
+@st.cache_resource
+def get_stylesheet():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'style.css'), encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
 
-# Topic database
-TOPIC_CATEGORIES = {
-    'Science': ['Physics', 'Chemistry', 'Biology', 'Mathematics', 'Computer Science', 'Astronomy', 'Geology', 'Medicine', 'Genetics', 'Ecology', 'Quantum Physics', 'Molecular Biology', 'Organic Chemistry', 'Calculus', 'Statistics'],
-    'Technology': ['Artificial Intelligence', 'Machine Learning', 'Blockchain', 'Internet of Things', 'Cybersecurity', 'Cloud Computing', 'Robotics', 'Data Science', 'Web Development', 'Mobile Technology', 'Virtual Reality', 'Augmented Reality', '5G Technology', 'Quantum Computing'],
-    'History': ['Ancient Civilizations', 'World Wars', 'Indian History', 'Medieval Period', 'Renaissance', 'Industrial Revolution', 'Cold War', 'Ancient Egypt', 'Roman Empire', 'Mughal Empire', 'British Raj', 'Independence Movement', 'Archaeological Discoveries'],
-    'Geography': ['Continents', 'Countries', 'Rivers', 'Mountains', 'Climate Change', 'Natural Resources', 'Population Studies', 'Urban Planning', 'Ecosystems', 'Weather Patterns', 'Ocean Currents', 'Plate Tectonics', 'Biodiversity'],
-    'Arts & Literature': ['Literature', 'Music', 'Painting', 'Sculpture', 'Dance', 'Theater', 'Cinema', 'Photography', 'Architecture', 'Poetry', 'Classical Music', 'Folk Arts', 'Modern Art', 'Digital Art'],
-    'Languages': ['English Grammar', 'Hindi Literature', 'Sanskrit Studies', 'Tamil Poetry', 'Bengali Literature', 'Telugu Culture', 'Marathi Arts', 'Gujarati Heritage', 'Punjabi Folk', 'Urdu Poetry', 'Language Evolution', 'Linguistics'],
-    'Economics': ['Microeconomics', 'Macroeconomics', 'International Trade', 'Banking', 'Stock Market', 'Cryptocurrency', 'Economic Policy', 'Development Economics', 'Behavioral Economics', 'Game Theory'],
-    'Philosophy': ['Ancient Philosophy', 'Modern Philosophy', 'Ethics', 'Logic', 'Metaphysics', 'Political Philosophy', 'Eastern Philosophy', 'Western Philosophy', 'Indian Philosophy', 'Existentialism'],
-    'Health & Medicine': ['Anatomy', 'Physiology', 'Nutrition', 'Mental Health', 'Public Health', 'Pharmacology', 'Surgery', 'Pediatrics', 'Cardiology', 'Neurology', 'Traditional Medicine', 'Ayurveda'],
-    'Environment': ['Climate Change', 'Renewable Energy', 'Conservation', 'Pollution', 'Sustainability', 'Green Technology', 'Wildlife Protection', 'Forest Management', 'Water Resources', 'Carbon Footprint']
-}
-
-# Translations
-TRANSLATIONS = {
-    'en': {'explore': 'Explore', 'learn': 'Learn', 'quiz': 'Quiz', 'analytics': 'Analytics', 'search': 'Search topics...', 'level': 'Level', 'score': 'Score'},
-    'hi': {'explore': 'अन्वेषण', 'learn': 'सीखें', 'quiz': 'प्रश्नोत्तरी', 'analytics': 'विश्लेषण', 'search': 'विषय खोजें...', 'level': 'स्तर', 'score': 'अंक'},
-    'ta': {'explore': 'ஆராய்', 'learn': 'கற்று', 'quiz': 'வினாடி வினா', 'analytics': 'பகுப்பாய்வு', 'search': 'தலைப்புகளைத் தேடுங்கள்...', 'level': 'நிலை', 'score': 'மதிப்பெண்'},
-    'bn': {'explore': 'অন্বেষণ', 'learn': 'শিখুন', 'quiz': 'কুইজ', 'analytics': 'বিশ্লেষণ', 'search': 'বিষয় খুঁজুন...', 'level': 'স্তর', 'score': 'স্কোর'},
-    'te': {'explore': 'అన్వేషణ', 'learn': 'నేర్చుకో', 'quiz': 'క్విజ్', 'analytics': 'విశ్లేషణ', 'search': 'అంశాలను వెతకండి...', 'level': 'స్థాయి', 'score': 'స్కోర్'},
-    'mr': {'explore': 'शोधा', 'learn': 'शिका', 'quiz': 'प्रश्नमंजुषा', 'analytics': 'विश्लेषण', 'search': 'विषय शोधा...', 'level': 'स्तर', 'score': 'गुण'},
-    'gu': {'explore': 'અન્વેષણ', 'learn': 'શીખો', 'quiz': 'ક્વિઝ', 'analytics': 'વિશ્લેષણ', 'search': 'વિષયો શોધો...', 'level': 'સ્તર', 'score': 'સ્કોર'}
-}
-
-# Wikipedia API integration
-def get_wikipedia_summary(topic):
-    """Fetch Wikipedia summary for a topic"""
-    try:
-        url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + topic.replace(" ", "_")
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'title': data.get('title', topic),
-                'summary': data.get('extract', 'No summary available'),
-                'url': data.get('content_urls', {}).get('desktop', {}).get('page', ''),
-                'image': data.get('thumbnail', {}).get('source', '') if data.get('thumbnail') else ''
-            }
-    except:
-        pass
-    return None
-
-def generate_content(topic):
-    """Generate educational content dynamically"""
-    content = f"""
-    {topic} is a fundamental concept that encompasses various aspects of knowledge and understanding. This field of study involves systematic investigation, analysis, and practical application of principles that have been developed through extensive research and observation.
-    
-    Understanding {topic} is crucial for developing comprehensive knowledge in this field. Students and professionals in related fields benefit from comprehensive understanding of core concepts, methodologies, and current trends that shape this discipline.
-    
-    {topic} has wide-ranging applications in modern society and continues to evolve with new discoveries. From theoretical foundations to practical implementations, this subject area demonstrates significant relevance in solving real-world problems and advancing human knowledge.
-    
-    Current research in {topic} focuses on innovative approaches and technological advancements. Ongoing studies continue to reveal new insights, challenge existing paradigms, and open pathways for innovation and discovery.
-    
-    The future of {topic} holds promising developments that will impact various sectors. Emerging technologies, changing global needs, and interdisciplinary approaches are reshaping the landscape and creating new opportunities for growth and development.
-    """
-    
-    return {
-        'title': topic,
-        'description': f"Comprehensive study of {topic}",
-        'content': content.strip(),
-        'category': get_category(topic),
-        'difficulty': random.choice(['Beginner', 'Intermediate', 'Advanced']),
-        'estimated_time': f"{random.randint(10, 45)} minutes"
-    }
-
-def get_category(topic):
-    for category, topics in TOPIC_CATEGORIES.items():
-        if topic in topics:
-            return category
-    return 'General'
+st.markdown(get_stylesheet(), unsafe_allow_html=True)
+
+# Search, content, quiz and summary logic lives in core.EduWiki, shared by
+# every session; requests is only imported once a summary is asked for
+@st.cache_resource
+def get_core():
+    """Headless core shared by every session of this server process"""
+    core = EduWiki()
+    # Gauges read resources only once something else has built them
+    metrics.gauge('http.upstream_requests', lambda: core.loaded('fetcher').upstream_requests)
+    metrics.gauge('http.coalesced_requests', lambda: core.loaded('fetcher').coalesced_requests)
+    metrics.gauge('content.memo_hits', lambda: core.loaded('content_store').get.cache_info().hits)
+    metrics.gauge('content.memo_misses', lambda: core.loaded('content_store').get.cache_info().misses)
+    return core
 
+@timed('wiki.summary')
+def wikipedia_summary(topic):
+    """Article from the offline pack when it has one, else the Wikipedia summary"""
+    return get_core().summary(topic)
+
+@timed('search')
 def search_topics(query):
-    if not query:
-        return []
-    
-    query_lower = query.lower()
-    results = []
-    
-    for category, topics in TOPIC_CATEGORIES.items():
-        for topic in topics:
-            if query_lower in topic.lower():
-                results.append(topic)
-    
-    if len(results) < 5:
-        for category, topics in TOPIC_CATEGORIES.items():
-            for topic in topics:
-                if any(word in topic.lower() for word in query_lower.split()):
-                    if topic not in results:
-                        results.append(topic)
-    
-    return results[:20]
+    return get_core().search(query)
 
+@timed('quiz.generate')
 def generate_quiz(topic):
     """Generate quiz questions for any topic"""
-    question_types = [
-        f"What is the primary focus of {topic}?",
-        f"Which field is most closely related to {topic}?",
-        f"What are the main applications of {topic}?",
-        f"How does {topic} contribute to modern society?",
-        f"What skills are essential for understanding {topic}?"
-    ]
-    
-    questions = []
-    for i, q_template in enumerate(random.sample(question_types, min(3, len(question_types)))):
-        if i % 2 == 0:
-            options = ['Innovation and Research', 'Practical Applications', 'Theoretical Framework', 'Historical Development']
-            questions.append({
-                'question': q_template,
-                'options': options,
-                'answer': random.choice(options),
-                'type': 'mcq',
-                'points': 15
-            })
-        else:
-            questions.append({
-                'question': f"The study of {topic} primarily involves _____ and analysis.",
-                'answer': 'research',
-                'type': 'fill',
-                'points': 10
-            })
-    
-    return questions
+    return get_core().quiz(topic)
+
+# Background prefetch
+PREFETCH_NEIGHBOURS = 4
+
+@st.cache_resource
+def get_prefetcher():
+    """Background cache warmer shared by every session"""
+    prefetcher = Prefetcher()
+    metrics.gauge('prefetch.hit_rate', lambda: prefetcher.hit_rate)
+    metrics.gauge('prefetch.pending', lambda: prefetcher.stats()['pending'])
+    return prefetcher
+
+def likely_next_topics(topic):
+    """Topics a learner tends to open next: category neighbours, then bookmarks"""
+    topics = catalog.topics_in(catalog.category_of(topic))
+    start = topics.index(topic) + 1 if topic in topics else 0
+    neighbours = [topics[(start + i) % len(topics)] for i in range(min(PREFETCH_NEIGHBOURS, len(topics)))]
+    return [t for t in dict.fromkeys(neighbours + progress.recent_bookmarks(3)) if t != topic]
+
+def prefetch_around(topic):
+    """Warm content of likely next topics, then summaries of the open and next topics.
+
+    Replaces whatever this learner still had queued. Summaries are skipped
+    while Wikipedia fetches are failing, so they don't occupy the workers.
+    """
+    language = translations.language
+    core = get_core()
+    next_topics = likely_next_topics(topic)
+    tasks = [(('content', t, language), lambda t=t: core.content(t, language)) for t in next_topics]
+    wiki_cache = core.loaded('wiki_cache')
+    if wiki_cache is None or not wiki_cache.recently_failed():
+        tasks += [(('wiki', t), lambda t=t: wikipedia_summary(t)) for t in [topic] + next_topics]
+    get_prefetcher().schedule(progress.learner, tasks)
+
+# Learner progress
+@st.cache_resource
+def get_progress_store():
+    """Durable progress database shared by every session"""
+    return ProgressStore()
+
+def get_progress():
+    """This session's learner progress, loaded from the store on first use.
+
+    The learner id lives in the URL so a reconnect or reload resumes it.
+    """
+    if 'progress' not in st.session_state:
+        learner = st.query_params.get('learner')
+        if not learner:
+            learner = uuid.uuid4().hex
+            st.query_params['learner'] = learner
+        st.session_state.progress = get_progress_store().load(learner)
+    return st.session_state.progress
+
+@timed('analytics.chart')
+def quiz_analytics(progress):
+    """Quiz chart and per-category averages, rebuilt only when new results arrive"""
+    cached = st.session_state.get('quiz_analytics')
+    if cached and cached[0] == (progress.learner, progress.stats.version):
+        return cached[1]
+    import plotly.express as px  # deferred: only learners with quiz results pay for the import
+    dates = [q['date'] for q in progress.quiz_scores]
+    scores = [q['score'] for q in progress.quiz_scores]
+    keep = lttb(scores)
+    fig = px.line(x=[dates[i] for i in keep], y=[scores[i] for i in keep], title="Quiz Performance Over Time", markers=True)
+    categories = sorted(progress.stats.category_averages(catalog.category_of).items())
+    st.session_state.quiz_analytics = ((progress.learner, progress.stats.version), (fig, categories))
+    return fig, categories
 
 # Initialize session state
-if 'user_score' not in st.session_state:
-    st.session_state.user_score = 0
-if 'bookmarks' not in st.session_state:
-    st.session_state.bookmarks = []
-if 'quiz_scores' not in st.session_state:
-    st.session_state.quiz_scores = []
 if 'language' not in st.session_state:
     st.session_state.language = 'en'
-if 'learning_history' not in st.session_state:
-    st.session_state.learning_history = []
+progress = get_progress()
+
+catalog = get_core().catalog
 
 def t(key):
-    return TRANSLATIONS.get(st.session_state.language, {}).get(key, key)
+    return translations.t(key)
+
+BROWSE_PAGE_SIZE = 30
+
+def set_browse_page(category, page):
+    st.session_state[f"browse_page_{category}"] = page
+
+@st.fragment
+@timed('browse')
+def browse_categories():
+    """Category expanders that only build the open page of topic buttons"""
+    for category in catalog.categories:
+        count = catalog.count(category)
+        expander = st.expander(f"📖 {translations.category(category)} ({count} topics)", key=f"browse_{category}", on_change="rerun")
+        if not expander.open:
+            continue
+        with expander:
+            pages = max(1, -(-count // BROWSE_PAGE_SIZE))
+            page = min(st.session_state.get(f"browse_page_{category}", 0), pages - 1)
+            cols = st.columns(3)
+            for i, topic in enumerate(catalog.page(category, page, BROWSE_PAGE_SIZE)):
+                with cols[i % 3]:
+                    if st.button(translations.topic(topic), key=f"cat_{category}_{topic}"):
+                        st.session_state.selected_topic = topic
+                        st.rerun()
+            if pages > 1:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    st.button("◀ Previous", key=f"browse_prev_{category}", disabled=page == 0,
+                              on_click=set_browse_page, args=(category, page - 1))
+                with col_page:
+                    st.caption(f"Page {page + 1} of {pages}")
+                with col_next:
+                    st.button("Next ▶", key=f"browse_next_{category}", disabled=page == pages - 1,
+                              on_click=set_browse_page, args=(category, page + 1))
 
 # Header
 st.markdown("""
@@ -167,28 +172,28 @@ st.markdown("""
 # Language selector
 col1, col2 = st.columns([4, 1])
 with col2:
-    languages = {'en': '🇬🇧 English', 'hi': '🇮🇳 हिंदी', 'ta': '🇮🇳 தமிழ்', 'bn': '🇮🇳 বাংলা', 'te': '🇮🇳 తెలుగు', 'mr': '🇮🇳 मराठी', 'gu': '🇮🇳 ગુજરાતી'}
-    st.session_state.language = st.selectbox("Language:", list(languages.keys()), format_func=lambda x: languages[x], index=0)
+    st.session_state.language = st.selectbox("Language:", list(LANGUAGES.keys()), format_func=lambda x: LANGUAGES[x], index=0)
+translations = get_translations(st.session_state.language)
 
 # Sidebar
 with st.sidebar:
     st.header(f"📊 Your Progress")
     
-    level = min(20, (st.session_state.user_score // 100) + 1)
+    level = min(20, (progress.score // 100) + 1)
     st.markdown(f'<div class="level-badge">{t("level")} {level}</div>', unsafe_allow_html=True)
-    st.progress((st.session_state.user_score % 100) / 100)
-    st.metric(t("score"), st.session_state.user_score)
+    st.progress((progress.score % 100) / 100)
+    st.metric(t("score"), progress.score)
     
-    if st.session_state.bookmarks:
+    if progress.bookmarks:
         st.subheader("🔖 Bookmarks")
-        for bookmark in st.session_state.bookmarks[-3:]:
-            if st.button(f"⭐ {bookmark[:20]}...", key=f"bm_{bookmark}"):
+        for bookmark in progress.recent_bookmarks(3):
+            if st.button(f"⭐ {translations.topic(bookmark)[:20]}...", key=f"bm_{bookmark}"):
                 st.session_state.selected_topic = bookmark
 
 # Main tabs
 tab1, tab2, tab3, tab4 = st.tabs([f"🔍 {t('explore')}", f"📚 {t('learn')}", f"🧠 {t('quiz')}", f"📈 {t('analytics')}"])
 
-with tab1:
+with tab1, timer('tab.explore'):
     st.header(f"🔍 {t('explore')} Topics")
     
     search_query = st.text_input(f"🔍 {t('search')}", placeholder="AI, Physics, History, Biology...")
@@ -200,38 +205,35 @@ with tab1:
             cols = st.columns(3)
             for i, topic in enumerate(results):
                 with cols[i % 3]:
-                    if st.button(f"📚 {topic}", key=f"search_{topic}"):
+                    if st.button(f"📚 {translations.topic(topic)}", key=f"search_{topic}"):
                         st.session_state.selected_topic = topic
                         st.rerun()
     
     st.subheader("📋 Browse Categories")
-    for category, topics in TOPIC_CATEGORIES.items():
-        with st.expander(f"📖 {category} ({len(topics)} topics)"):
-            cols = st.columns(3)
-            for i, topic in enumerate(topics):
-                with cols[i % 3]:
-                    if st.button(topic, key=f"cat_{category}_{topic}"):
-                        st.session_state.selected_topic = topic
-                        st.rerun()
+    browse_categories()
 
-with tab2:
+with tab2, timer('tab.learn'):
     st.header(f"📚 {t('learn')}")
     
     if 'selected_topic' not in st.session_state or not st.session_state.selected_topic:
         st.info("👆 Select a topic from Explore to start learning!")
         
         st.subheader("✨ Featured Topics")
-        all_topics = [topic for topics in TOPIC_CATEGORIES.values() for topic in topics]
-        featured = random.sample(all_topics, min(6, len(all_topics)))
+        featured = catalog.sample(6)
         cols = st.columns(3)
         for i, topic in enumerate(featured):
             with cols[i % 3]:
-                if st.button(f"🌟 {topic}", key=f"featured_{topic}"):
+                if st.button(f"🌟 {translations.topic(topic)}", key=f"featured_{topic}"):
                     st.session_state.selected_topic = topic
                     st.rerun()
     else:
         topic = st.session_state.selected_topic
-        content = generate_content(topic)
+        if st.session_state.get('prefetched_for') != (topic, translations.language):
+            st.session_state.prefetched_for = (topic, translations.language)
+            get_prefetcher().record(('content', topic, translations.language))
+            prefetch_around(topic)
+        with timer('content'):
+            content = get_core().content(topic, translations.language)
         
         col1, col2 = st.columns([3, 1])
         
@@ -256,8 +258,11 @@ with tab2:
             
             # Show Wikipedia summary if requested
             if hasattr(st.session_state, 'show_wiki') and st.session_state.show_wiki:
+                if st.session_state.get('wiki_shown_for') != topic:
+                    st.session_state.wiki_shown_for = topic
+                    get_prefetcher().record(('wiki', topic))
                 with st.spinner("Fetching Wikipedia content..."):
-                    wiki_data = get_wikipedia_summary(topic)
+                    wiki_data = wikipedia_summary(topic)
                     if wiki_data:
                         st.markdown('<div class="wiki-card">', unsafe_allow_html=True)
                         st.markdown(f"**📝 Wikipedia Summary: {wiki_data['title']}**")
@@ -282,34 +287,31 @@ with tab2:
             col_a, col_b = st.columns(2)
             with col_a:
                 if st.button("🔖 Save"):
-                    if topic not in st.session_state.bookmarks:
-                        st.session_state.bookmarks.append(topic)
+                    if progress.add_bookmark(topic):
                         st.success("Saved!")
             
             with col_b:
                 if st.button("✅ Done", type="primary"):
                     points = 30 + (level * 5)
-                    st.session_state.user_score += points
-                    st.session_state.learning_history.append({'topic': topic, 'date': datetime.now(), 'points': points})
+                    progress.complete_topic(topic, points)
                     st.balloons()
                     st.success(f"🎉 +{points} points!")
 
-with tab3:
+with tab3, timer('tab.quiz'):
     st.header(f"🧠 {t('quiz')}")
     
     if 'selected_topic' not in st.session_state or not st.session_state.selected_topic:
         st.info("Select a topic to take a quiz!")
         
         st.subheader("🎯 Quick Quiz")
-        all_topics = [topic for topics in TOPIC_CATEGORIES.values() for topic in topics]
         if st.button("🎲 Random Topic Quiz"):
-            random_topic = random.choice(all_topics)
+            random_topic = random.choice(catalog.topics)
             st.session_state.selected_topic = random_topic
             st.session_state.current_quiz = generate_quiz(random_topic)
             st.rerun()
     else:
         topic = st.session_state.selected_topic
-        st.subheader(f"Quiz: {topic}")
+        st.subheader(f"Quiz: {translations.topic(topic)}")
         
         if st.button("🎯 Start Quiz", type="primary"):
             st.session_state.current_quiz = generate_quiz(topic)
@@ -329,24 +331,11 @@ with tab3:
                     choice = st.radio("Choose:", q['options'], key=f"q_{i}")
             
             if st.button("📝 Submit Quiz", type="primary"):
-                score = 0
-                total = sum(q['points'] for q in questions)
-                
-                for i, q in enumerate(questions, 1):
-                    user_answer = st.session_state.get(f"q_{i}", "")
-                    if q['type'] == 'fill':
-                        if user_answer.lower().strip() == q['answer'].lower():
-                            score += q['points']
-                    else:
-                        if user_answer == q['answer']:
-                            score += q['points']
+                answers = [st.session_state.get(f"q_{i}", "") for i in range(1, len(questions) + 1)]
+                score, total = grade_quiz(questions, answers)
                 
                 percentage = (score / total) * 100 if total > 0 else 0
-                st.session_state.user_score += score
-                st.session_state.quiz_scores.append({
-                    'topic': topic, 'score': percentage, 'points': score,
-                    'date': datetime.now().strftime("%Y-%m-%d")
-                })
+                progress.add_quiz_score(topic, percentage, score)
                 
                 if percentage >= 80:
                     st.balloons()
@@ -358,27 +347,41 @@ with tab3:
                 
                 del st.session_state.current_quiz
 
-with tab4:
+with tab4, timer('tab.analytics'):
     st.header(f"📈 {t('analytics')}")
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Score", st.session_state.user_score)
+        st.metric("Total Score", progress.score)
     with col2:
-        st.metric("Topics Studied", len(st.session_state.learning_history))
+        st.metric("Topics Studied", progress.topics_studied)
     with col3:
-        st.metric("Quizzes Taken", len(st.session_state.quiz_scores))
+        st.metric("Quizzes Taken", progress.quizzes_taken)
     with col4:
-        st.metric("Bookmarks", len(st.session_state.bookmarks))
+        st.metric("Bookmarks", len(progress.bookmarks))
     
-    if st.session_state.quiz_scores:
-        dates = [q['date'] for q in st.session_state.quiz_scores]
-        scores = [q['score'] for q in st.session_state.quiz_scores]
-        fig = px.line(x=dates, y=scores, title="Quiz Performance Over Time", markers=True)
+    if progress.quiz_scores:
+        fig, categories = quiz_analytics(progress)
         st.plotly_chart(fig, use_container_width=True)
         
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Average Score", f"{progress.stats.average:.0f}%")
+        with col2:
+            st.metric(f"Last {len(progress.stats.recent)} Quizzes", f"{progress.stats.rolling_average:.0f}%")
+        with col3:
+            st.metric("Quiz Points", progress.stats.points)
+        
+        st.subheader("📅 By Day")
+        for day, average in list(progress.stats.daily_averages().items())[-7:]:
+            st.write(f"**{day}** — {average:.0f}%")
+        
+        st.subheader("📊 By Category")
+        for category, (count, average) in categories:
+            st.write(f"**{category}** — {average:.0f}% over {count} quizzes")
+        
         st.subheader("📋 Recent Activity")
-        for quiz in st.session_state.quiz_scores[-5:]:
+        for quiz in progress.quiz_scores[-5:]:
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
                 st.write(f"📖 {quiz['topic']}")
@@ -391,11 +394,28 @@ with tab4:
 
 # Footer
 st.markdown("---")
-total_topics = sum(len(topics) for topics in TOPIC_CATEGORIES.values())
 st.markdown(f"""
 <div style='text-align: center; padding: 1rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
             color: white; border-radius: 10px;'>
     <h4>🌟 EduWiki Offline - Complete Learning Platform</h4>
-    <p><em>{total_topics}+ Topics • 7 Indian Languages • Wikipedia Integration • Full Offline Experience</em></p>
+    <p><em>{len(catalog)}+ Topics • 7 Indian Languages • Wikipedia Integration • Full Offline Experience</em></p>
 </div>
 """, unsafe_allow_html=True)
+
+# Performance panel and metrics export; only with EDUWIKI_METRICS set, and the
+# panel only for ?admin=<EDUWIKI_ADMIN_TOKEN>
+if METRICS_ENABLED:
+    metrics.export_if_due()
+    admin_token = os.environ.get('EDUWIKI_ADMIN_TOKEN')
+    if admin_token and st.query_params.get('admin') == admin_token:
+        with st.sidebar.expander("⏱️ Performance"):
+            total, breakdown = metrics.rerun_breakdown()
+            st.caption(f"This rerun: {total * 1000:.1f} ms")
+            for name, seconds in sorted(breakdown.items(), key=lambda item: -item[1]):
+                st.write(f"`{name}` {seconds * 1000:.1f} ms")
+            snapshot = metrics.snapshot()
+            st.caption("Since start")
+            for name, timing in sorted(snapshot['timings'].items()):
+                st.write(f"`{name}` ×{timing['count']}, avg {timing['total'] / timing['count'] * 1000:.1f} ms, "
+                         f"max {timing['max'] * 1000:.1f} ms")
+            st.json({**snapshot['counters'], **snapshot['gauges']})
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+
+ARTICLE_PACK_PATH = os.environ.get(
+    'EDUWIKI_ARTICLES',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'articles.pack'))
+
+# Pack layout (all integers little-endian):
+#   header   magic, block count, entry count, block table offset, entry table offset
+#   blocks   zlib-compressed runs of JSON article records
+#   images   raw thumbnail bytes, stored uncompressed so they can be sliced from the map
+#   blocks   (offset, compressed length) per block
+#   entries  (title hash, block, offset in block, length, image offset, image length),
+#            sorted by title hash for binary search
+MAGIC = b'EDUWART1'
+_HEADER = struct.Struct('<8sIIQQ')
+_BLOCK = struct.Struct('<QI')
+_ENTRY = struct.Struct('<QIIIQI')
+BLOCK_SIZE = 64 * 1024
+CACHED_BLOCKS = 32
+
+
+def title_hash(title):
+    return int.from_bytes(hashlib.blake2b(title.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ArticlePack:
+    """Read-only, memory-mapped offline article store.
+
+    Only the blocks holding requested articles are decompressed, and a small
+    LRU keeps recently used blocks. Thumbnails are returned as memoryview
+    slices of the map.
+    """
+
+    def __init__(self, path=ARTICLE_PACK_PATH, cached_blocks=CACHED_BLOCKS):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.block_count, self.entry_count, self._blocks_at, self._entries_at = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an article pack")
+        self._view = memoryview(self._map)
+        self._cache = OrderedDict()
+        self._cached_blocks = cached_blocks
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_if_exists(cls, path=ARTICLE_PACK_PATH):
+        return cls(path) if os.path.exists(path) else None
+
+    def __len__(self):
+        return self.entry_count
+
+    def __contains__(self, title):
+        return self._find(title) is not None
+
+    def get(self, title):
+        """Article dict (title, summary, url, image) or None"""
+        entry = self._find(title)
+        if entry is None:
+            return None
+        _, block, offset, length, image_at, image_length = entry
+        record = json.loads(bytes(self._block(block)[offset:offset + length]))
+        if record.get('title') != title:
+            return None  # hash collision with another title
+        if image_length:
+            record['image'] = self._view[image_at:image_at + image_length]
+        return {
+            'title': record['title'],
+            'summary': record.get('summary', ''),
+            'url': record.get('url', ''),
+            'image': record.get('image', '')
+        }
+
+    def _find(self, title):
+        key = title_hash(title)
+        lo, hi = 0, self.entry_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = _ENTRY.unpack_from(self._map, self._entries_at + mid * _ENTRY.size)
+            if entry[0] < key:
+                lo = mid + 1
+            elif entry[0] > key:
+                hi = mid
+            else:
+                return entry
+        return None
+
+    def _block(self, block):
+        with self._lock:
+            data = self._cache.get(block)
+            if data is not None:
+                self._cache.move_to_end(block)
+                return data
+        offset, length = _BLOCK.unpack_from(self._map, self._blocks_at + block * _BLOCK.size)
+        data = memoryview(zlib.decompress(self._view[offset:offset + length]))
+        with self._lock:
+            self._cache[block] = data
+            while len(self._cache) > self._cached_blocks:
+                self._cache.popitem(last=False)
+        return data
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+def build_pack(articles, path=ARTICLE_PACK_PATH, block_size=BLOCK_SIZE):
+    """Write an article pack from dicts with title, summary, url and image.
+
+    ``image`` may be raw bytes (stored in the pack) or a URL string (kept in
+    the record). Returns the number of articles written.
+    """
+    blocks, images, entries = [], [], []
+    pending, pending_entries = bytearray(), []
+    seen = set()
+
+    def close_block():
+        if pending_entries:
+            blocks.append(zlib.compress(bytes(pending), 6))
+            entries.extend(pending_entries)
+            pending.clear()
+            pending_entries.clear()
+
+    for article in articles:
+        title = article['title']
+        key = title_hash(title)
+        if key in seen:
+            continue
+        seen.add(key)
+        record = {'title': title, 'summary': article.get('summary', ''), 'url': article.get('url', '')}
+        image = article.get('image') or b''
+        if isinstance(image, str):
+            record['image'] = image
+            image = b''
+        data = json.dumps(record, ensure_ascii=False).encode('utf-8')
+        if pending and len(pending) + len(data) > block_size:
+            close_block()
+        # Image offsets are resolved once all blocks have been written
+        pending_entries.append([key, len(blocks), len(pending), len(data), len(images), image])
+        pending.extend(data)
+        images.append(image)
+    close_block()
+
+    with open(path, 'wb') as f:
+        f.write(b'\0' * _HEADER.size)
+        block_table = []
+        for block in blocks:
+            block_table.append((f.tell(), len(block)))
+            f.write(block)
+        image_offsets = []
+        for image in images:
+            image_offsets.append(f.tell())
+            f.write(image)
+        blocks_at = f.tell()
+        for offset, length in block_table:
+            f.write(_BLOCK.pack(offset, length))
+        entries_at = f.tell()
+        for key, block, offset, length, image_index, image in sorted(entries, key=lambda e: e[0]):
+            f.write(_ENTRY.pack(key, block, offset, length, image_offsets[image_index] if image else 0, len(image)))
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, len(blocks), len(entries), blocks_at, entries_at))
+    return len(entries)
+
+
+def read_jsonl(path):
+    """Articles from a JSONL dump, accepting common field names.
+
+    Text comes from ``summary``, ``extract``, ``text`` or ``body``; an
+    ``image``/``thumbnail`` naming a local file is embedded, anything else is
+    kept as a URL.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            title = data.get('title')
+            if not title:
+                continue
+            image = data.get('image') or data.get('thumbnail') or ''
+            if isinstance(image, dict):
+                image = image.get('source', '')
+            local = os.path.join(base, image) if image else ''
+            if image and os.path.isfile(local):
+                with open(local, 'rb') as img:
+                    image = img.read()
+            yield {
+                'title': title,
+                'summary': data.get('summary') or data.get('extract') or data.get('text') or data.get('body') or '',
+                'url': data.get('url') or data.get('content_urls', {}).get('desktop', {}).get('page', ''),
+                'image': image
+            }
+
+
+if __name__ == '__main__':
+    # python articles.py import <dump.jsonl> [pack_path]
+    if len(sys.argv) < 3 or sys.argv[1] != 'import':
+        sys.exit("usage: python articles.py import <dump.jsonl> [pack_path]")
+    path = sys.argv[3] if len(sys.argv) > 3 else ARTICLE_PACK_PATH
+    print(f"Packed {build_pack(read_jsonl(sys.argv[2]), path)} articles into {path}")
@@ -0,0 +1,72 @@
+"""Measure Explore-tab render cost as the catalog grows.
+
+Runs app.py headlessly with streamlit.testing AppTest against synthetic
+catalogs of 100, 1k and 10k topics and reports script run time and the
+serialized size of the rendered element tree (a proxy for the websocket
+delta), with every category collapsed and with one category open.
+
+    python benchmarks/bench_browse.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from catalog import Catalog  # noqa: E402
+
+SIZES = [100, 1_000, 10_000]
+CATEGORIES = 10
+RERUNS = 5
+
+
+def synthetic_catalog(size):
+    per_category = size // CATEGORIES
+    return Catalog({f"Category {c}": [f"Topic {c}-{i}" for i in range(per_category)]
+                    for c in range(CATEGORIES)})
+
+
+def tree_bytes(node):
+    size = node.proto.ByteSize() if getattr(node, 'proto', None) is not None else 0
+    children = getattr(node, 'children', None) or {}
+    return size + sum(tree_bytes(child) for child in children.values())
+
+
+def measure(at, open_category=None):
+    times = []
+    for _ in range(RERUNS):
+        # AppTest does not carry expander state between runs, so reopen it each time
+        if open_category:
+            at.session_state[f"browse_{open_category}"] = True
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    assert not at.exception, at.exception
+    return statistics.median(times) * 1000, tree_bytes(at._tree) / 1024, len(at.button)
+
+
+def main():
+    print(f"{'topics':>7} {'state':>10} {'run ms':>8} {'tree KiB':>9} {'buttons':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Read by the app's modules on import; keeps benchmark learners out of the real stores
+        os.environ['EDUWIKI_WIKI_CACHE'] = os.path.join(tmp, 'wiki_cache.sqlite3')
+        os.environ['EDUWIKI_PROGRESS'] = os.path.join(tmp, 'progress.sqlite3')
+        for size in SIZES:
+            path = os.path.join(tmp, f"topics_{size}.jsonl")
+            synthetic_catalog(size).save(path)
+            os.environ['EDUWIKI_CATALOG'] = path
+            st.cache_resource.clear()
+            at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+            for state, open_category in (('collapsed', None), ('one open', 'Category 0')):
+                run_ms, kib, buttons = measure(at, open_category)
+                print(f"{size:>7} {state:>10} {run_ms:>8.1f} {kib:>9.1f} {buttons:>8}")
+
+
+if __name__ == '__main__':
+    main()
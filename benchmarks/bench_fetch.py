@@ -0,0 +1,80 @@
+"""Compare per-call requests.get with the pooled, coalescing Fetcher.
+
+Simulates SESSIONS concurrent learners who each open TOPICS topics drawn
+from a small popular set (a classroom opening the same pages), against
+the local stub server, and reports latency percentiles and how many
+requests reached upstream.
+
+    python benchmarks/bench_fetch.py [sessions] [topics_per_session]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+import wiki  # noqa: E402
+from fetcher import Fetcher  # noqa: E402
+from stub_wiki import StubWikiServer  # noqa: E402
+
+POPULAR = ['Physics', 'Chemistry', 'Biology', 'Ancient Egypt', 'Machine Learning', 'Missing Topic']
+
+
+def naive_summary(topic):
+    response = requests.get(wiki.WIKI_SUMMARY_URL + topic.replace(" ", "_"), timeout=5)
+    return wiki.parse_summary(topic, response.json()) if response.status_code == 200 else None
+
+
+def run(label, fn, server, sessions, per_session):
+    rng = random.Random(42)
+    plans = [[rng.choice(POPULAR) for _ in range(per_session)] for _ in range(sessions)]
+    latencies = []
+
+    def learner(plan):
+        for topic in plan:
+            start = time.perf_counter()
+            fn(topic)
+            latencies.append(time.perf_counter() - start)
+
+    server.requests = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(sessions) as pool:
+        list(pool.map(learner, plans))
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<28} p50 {quantiles[49] * 1000:7.1f} ms  p99 {quantiles[98] * 1000:7.1f} ms  "
+          f"upstream {server.requests:5d}  wall {elapsed:5.2f} s")
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    server = StubWikiServer(latency=0.05).start()
+    wiki.WIKI_SUMMARY_URL = server.summary_url
+    print(f"{sessions} sessions x {per_session} topics, stub latency 50 ms")
+
+    run('requests.get per call', naive_summary, server, sessions, per_session)
+
+    fetcher = Fetcher(max_connections=8)
+    run('pooled + coalesced', lambda topic: wiki.get_wikipedia_summary(topic, fetcher=fetcher),
+        server, sessions, per_session)
+
+    cache = wiki.WikiCache(':memory:')
+    run('pooled + coalesced + cache', lambda topic: wiki.get_wikipedia_summary(topic, cache, fetcher=fetcher),
+        server, sessions, per_session)
+
+    server.requests = 0
+    start = time.perf_counter()
+    wiki.get_wikipedia_summaries([f"Topic {i}" for i in range(100)], fetcher=fetcher)
+    print(f"batch of 100 topics: {time.perf_counter() - start:.2f} s, upstream {server.requests}")
+    fetcher.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
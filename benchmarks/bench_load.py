@@ -0,0 +1,197 @@
+"""Load-test app.py with concurrent virtual learners.
+
+Each learner is a headless AppTest session on its own thread, all sharing
+one process (and so one set of cache_resource objects), as on a server.
+Every learner repeats the explore -> learn -> quiz -> analytics journey:
+search, open a result, fetch its Wikipedia summary from the local stub
+server, bookmark it, take and submit the quiz. Every tab renders on every
+rerun, so the analytics tab is exercised throughout.
+
+AppTest swaps process-global runtime state for the length of a run, so
+script runs are serialized; "wait" latency therefore includes queueing
+behind other learners and grows with --learners, while "service" is the
+run time alone. Background threads (progress writer, prefetcher, HTTP
+pool) still run concurrently with the runs.
+
+Reports service and wait percentiles per interaction, throughput, and CPU
+time and resident memory per session. With --max-service-p95 the exit
+status is non-zero when any interaction's service p95 exceeds the budget,
+or when a run raised, so CI catches regressions independently of the
+learner count; --json writes the results for trend tracking.
+
+    python benchmarks/bench_load.py [--learners 8] [--journeys 3] [--max-service-p95 MS] [--json PATH]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from stub_wiki import StubWikiServer  # noqa: E402
+
+QUERIES = ['phys', 'chem', 'bio', 'history', 'math', 'ai', 'music', 'geo', 'art', 'econ']
+# AppTest.run installs and tears down a process-wide Runtime instance
+RUN_LOCK = threading.Lock()
+INTERACTIONS = ['load', 'search', 'open', 'wiki', 'bookmark', 'start_quiz', 'submit_quiz']
+
+
+def rss_bytes():
+    """Current resident set size; falls back to the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class VirtualLearner:
+    def __init__(self, number, journeys):
+        self.rng = random.Random(number)
+        self.journeys = journeys
+        self.latencies = {name: [] for name in INTERACTIONS}
+        self.service = {name: [] for name in INTERACTIONS}
+        self.errors = []
+        self.at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=120)
+        self.at.query_params['learner'] = f"load-{number}"
+
+    def step(self, name, action):
+        start = time.perf_counter()
+        with RUN_LOCK:
+            served = time.perf_counter()
+            action()
+        end = time.perf_counter()
+        self.latencies[name].append(end - start)
+        self.service[name].append(end - served)
+        if self.at.exception:
+            self.errors.append(f"{name}: {self.at.exception[0].message}")
+            return False
+        return True
+
+    def click(self, label):
+        for button in self.at.button:
+            if button.label.startswith(label):
+                return button.click().run()
+        raise LookupError(f"no {label!r} button")
+
+    def journey(self):
+        at = self.at
+        if not self.step('search', lambda: at.text_input[0].input(self.rng.choice(QUERIES)).run()):
+            return
+        results = [b for b in at.button if b.key and b.key.startswith('search_')]
+        if not results:
+            return
+        if not self.step('open', lambda: self.rng.choice(results).click().run()):
+            return
+        if not self.step('wiki', lambda: self.click("📖 Get Wikipedia Summary")):
+            return
+        if not self.step('bookmark', lambda: self.click("🔖 Save")):
+            return
+        if not self.step('start_quiz', lambda: self.click("🎯 Start Quiz")):
+            return
+        for i, question in enumerate(at.session_state.current_quiz, 1):
+            if question['type'] == 'fill':
+                at.text_input(key=f"q_{i}").input(self.rng.choice(['', question.get('answer', '')]))
+            else:
+                at.radio(key=f"q_{i}").set_value(self.rng.choice(question['options']))
+        self.step('submit_quiz', lambda: self.click("📝 Submit Quiz"))
+
+    def run(self):
+        if not self.step('load', self.at.run):
+            return self
+        for _ in range(self.journeys):
+            self.journey()
+        return self
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--learners', type=int, default=8)
+    parser.add_argument('--journeys', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=50, help="stub wiki latency in ms")
+    parser.add_argument('--max-service-p95', type=float,
+                        help="fail if any interaction's service-time p95 exceeds this (ms)")
+    parser.add_argument('--json', help="write results to this path")
+    args = parser.parse_args()
+
+    server = StubWikiServer(latency=args.latency / 1000).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Read by the app's modules on import, so set before the first session runs
+        os.environ['EDUWIKI_WIKI_URL'] = server.summary_url
+        os.environ['EDUWIKI_WIKI_CACHE'] = os.path.join(tmp, 'wiki_cache.sqlite3')
+        os.environ['EDUWIKI_PROGRESS'] = os.path.join(tmp, 'progress.sqlite3')
+
+        # One warm-up session loads modules and shared resources, so the
+        # per-session figures below measure sessions rather than startup
+        warmup = VirtualLearner(-1, 1).run()
+        if warmup.errors:
+            sys.exit(f"warm-up failed: {warmup.errors[0]}")
+        baseline_rss = rss_bytes()
+
+        learners = [VirtualLearner(number, args.journeys) for number in range(args.learners)]
+        cpu_start, start = time.process_time(), time.perf_counter()
+        with ThreadPoolExecutor(args.learners) as pool:
+            list(pool.map(VirtualLearner.run, learners))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        session_rss = (rss_bytes() - baseline_rss) / args.learners
+    server.shutdown()
+
+    results = {'learners': args.learners, 'journeys': args.journeys, 'stub_latency_ms': args.latency,
+               'wall_s': elapsed, 'cpu_s_per_session': cpu / args.learners,
+               'rss_mib_per_session': session_rss / 2 ** 20, 'upstream_requests': server.requests,
+               'errors': [error for learner in learners for error in learner.errors], 'interactions': {}}
+    total = 0
+    print(f"{args.learners} learners x {args.journeys} journeys, stub latency {args.latency:.0f} ms")
+    print(f"{'':<12} {'':>5} {'service ms':^26} {'wait ms (incl. queueing)':^26}")
+    print(f"{'interaction':<12} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name in INTERACTIONS:
+        samples = [s * 1000 for learner in learners for s in learner.latencies[name]]
+        if not samples:
+            continue
+        total += len(samples)
+        service = [s * 1000 for learner in learners for s in learner.service[name]]
+        row = {'n': len(samples),
+               'service_p50': statistics.median(service), 'service_p95': percentile(service, 95),
+               'service_p99': percentile(service, 99), 'service_max': max(service),
+               'p50': statistics.median(samples), 'p95': percentile(samples, 95),
+               'p99': percentile(samples, 99), 'max': max(samples)}
+        results['interactions'][name] = row
+        print(f"{name:<12} {row['n']:>5} {row['service_p50']:>8.1f} {row['service_p95']:>8.1f} "
+              f"{row['service_p99']:>8.1f} {row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}")
+    results['throughput'] = total / elapsed
+    print(f"throughput {results['throughput']:.1f} interactions/s, wall {elapsed:.1f} s, "
+          f"upstream {server.requests}")
+    print(f"per session: cpu {results['cpu_s_per_session']:.2f} s, rss {results['rss_mib_per_session']:.1f} MiB")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failures = [f"error: {error}" for error in results['errors']]
+    if args.max_service_p95 is not None:
+        failures += [f"{name}: service p95 {row['service_p95']:.1f} ms > {args.max_service_p95:.1f} ms"
+                     for name, row in results['interactions'].items()
+                     if row['service_p95'] > args.max_service_p95]
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Quiz generation and grading throughput: original code vs QuizBank.
+
+Before timing, checks that grade_quiz and grade_submissions agree with the
+original grading on random full, partial and empty submissions, and exits
+non-zero if they don't.
+
+    python benchmarks/bench_quiz.py [topics] [class_size]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz import QuizBank, grade_quiz, grade_submissions  # noqa: E402
+
+
+def legacy_generate_quiz(topic):
+    """generate_quiz() as it was before the quiz bank"""
+    question_types = [
+        f"What is the primary focus of {topic}?",
+        f"Which field is most closely related to {topic}?",
+        f"What are the main applications of {topic}?",
+        f"How does {topic} contribute to modern society?",
+        f"What skills are essential for understanding {topic}?"
+    ]
+    questions = []
+    for i, q_template in enumerate(random.sample(question_types, min(3, len(question_types)))):
+        if i % 2 == 0:
+            options = ['Innovation and Research', 'Practical Applications', 'Theoretical Framework', 'Historical Development']
+            questions.append({'question': q_template, 'options': options, 'answer': random.choice(options),
+                              'type': 'mcq', 'points': 15})
+        else:
+            questions.append({'question': f"The study of {topic} primarily involves _____ and analysis.",
+                              'answer': 'research', 'type': 'fill', 'points': 10})
+    return questions
+
+
+def legacy_grade(questions, answers):
+    score = 0
+    total = sum(q['points'] for q in questions)
+    for q, user_answer in zip(questions, answers):
+        if q['type'] == 'fill':
+            if user_answer.lower().strip() == q['answer'].lower():
+                score += q['points']
+        elif user_answer == q['answer']:
+            score += q['points']
+    return score, total
+
+
+def check_grading(bank, topics, rng, rounds=2000):
+    """Mismatches between the bank's graders and legacy_grade, as readable strings"""
+    failures = []
+    for _ in range(rounds):
+        quiz = bank.sample(rng.choice(topics), rng.randint(1, 5), rng)
+        answers = [rng.choice([q['answer'], q['answer'].upper(), ' Research ', 'Other']) for q in quiz]
+        answers = answers[:rng.randint(0, len(answers))]
+        # The original padded unanswered questions with '', which never matches
+        expected = legacy_grade(quiz, answers + [''] * (len(quiz) - len(answers)))
+        got = grade_quiz(quiz, answers), grade_submissions(quiz, [answers])[0]
+        if got != (expected, expected):
+            failures.append(f"{[q['key'] for q in quiz]} {answers}: expected {expected}, got {got}")
+    return failures
+
+
+def rate(fn, seconds=1.0):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    n_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    class_size = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    topics = [f"Topic {i}" for i in range(n_topics)]
+    start = time.perf_counter()
+    bank = QuizBank.build(topics)
+    print(f"built bank for {n_topics} topics in {time.perf_counter() - start:.2f} s ({len(bank._answers)} bytes)")
+
+    rng = random.Random(0)
+    failures = check_grading(bank, topics, rng)
+    if failures:
+        sys.exit(f"grading disagrees with the original in {len(failures)} cases, e.g. {failures[0]}")
+    print("grading matches the original")
+
+    quiz = bank.sample('Topic 7')
+    submissions = [[rng.choice([q['answer'], 'Other ']) if q['type'] == 'mcq' else ' Research ' for q in quiz]
+                   for _ in range(class_size)]
+
+    print(f"{'':<28}{'legacy/s':>12}{'bank/s':>12}")
+    print(f"{'generate quiz':<28}{rate(lambda: legacy_generate_quiz(rng.choice(topics))):>12,.0f}"
+          f"{rate(lambda: bank.sample(rng.choice(topics))):>12,.0f}")
+    print(f"{'grade one submission':<28}{rate(lambda: legacy_grade(quiz, submissions[0])):>12,.0f}"
+          f"{rate(lambda: grade_quiz(quiz, submissions[0])):>12,.0f}")
+    legacy_class = rate(lambda: [legacy_grade(quiz, answers) for answers in submissions]) * class_size
+    bank_class = rate(lambda: grade_submissions(quiz, submissions)) * class_size
+    print(f"{f'grade class of {class_size} (subs)':<28}{legacy_class:>12,.0f}{bank_class:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
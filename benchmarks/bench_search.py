@@ -0,0 +1,77 @@
+"""Compare the original linear search_topics() scan with SearchIndex.
+
+Synthetic catalogs are built by combining words from the real topic
+list, so hit rates look like real queries at every size.
+
+    python benchmarks/bench_search.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog  # noqa: E402
+from search import SearchIndex, tokenize  # noqa: E402
+
+SIZES = [100, 10_000, 100_000]
+QUERIES = ['phys', 'ology', 'quantum computing', 'indian history', 'ai', 'ayurved', 'fysics', 'zzz']
+
+
+def linear_search(categories, query):
+    """search_topics() as it was before the index"""
+    if not query:
+        return []
+    query_lower = query.lower()
+    results = []
+    for category, topics in categories.items():
+        for topic in topics:
+            if query_lower in topic.lower():
+                results.append(topic)
+    if len(results) < 5:
+        for category, topics in categories.items():
+            for topic in topics:
+                if any(word in topic.lower() for word in query_lower.split()):
+                    if topic not in results:
+                        results.append(topic)
+    return results[:20]
+
+
+def synthetic_catalog(size, seed=1):
+    rng = random.Random(seed)
+    words = sorted({word.title() for topic in Catalog.load().topics for word in tokenize(topic)})
+    categories = {}
+    names = set()
+    while len(names) < size:
+        name = ' '.join(rng.sample(words, rng.randint(1, 3)))
+        if len(names) > len(words):
+            name += f" {rng.randint(1, 999)}"
+        if name not in names:
+            names.add(name)
+            categories.setdefault(f"Category {len(names) % 50}", []).append(name)
+    return categories
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'topics':>8} {'build ms':>9} {'linear ms/q':>12} {'index ms/q':>11} {'speedup':>8}")
+    for size in SIZES:
+        categories = synthetic_catalog(size)
+        start = time.perf_counter()
+        index = SearchIndex(topic for topics in categories.values() for topic in topics)
+        build = time.perf_counter() - start
+        repeat = max(1, 2000 // size)
+        linear = timed(lambda: [linear_search(categories, q) for q in QUERIES], repeat) / len(QUERIES)
+        indexed = timed(lambda: [index.search(q) for q in QUERIES], repeat * 10) / len(QUERIES)
+        print(f"{size:>8} {build * 1000:>9.1f} {linear * 1000:>12.3f} {indexed * 1000:>11.3f} {linear / indexed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
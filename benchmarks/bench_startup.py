@@ -0,0 +1,75 @@
+"""Cold-start, warm-rerun and memory benchmark for the Streamlit script.
+
+Each sample runs in a fresh interpreter so module imports are really cold.
+Reports the first script run (what a new container pays), the median warm
+rerun, peak RSS, and whether plotly.express and requests were imported.
+
+    python benchmarks/bench_startup.py [script] [samples]
+
+Pass an older app.py (e.g. extracted with ``git show``) as ``script`` to
+compare against it.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, os, resource, statistics, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_import = time.perf_counter() - start
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+start = time.perf_counter()
+at.run()
+cold = time.perf_counter() - start
+warm = []
+for _ in range(5):
+    start = time.perf_counter()
+    at.run()
+    warm.append(time.perf_counter() - start)
+print(json.dumps({
+    'streamlit_import': streamlit_import, 'cold': cold, 'warm': statistics.median(warm),
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'plotly_express': 'plotly.express' in sys.modules, 'requests': 'requests' in sys.modules,
+    'error': bool(at.exception),
+}))
+'''
+
+
+def sample(script, tmp):
+    env = dict(os.environ,
+               EDUWIKI_PROGRESS=os.path.join(tmp, 'progress.sqlite3'),
+               EDUWIKI_WIKI_CACHE=os.path.join(tmp, 'wiki.sqlite3'))
+    out = subprocess.run([sys.executable, '-c', CHILD, script], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    script = os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else os.path.join(ROOT, 'app.py')
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [sample(script, tmp) for _ in range(samples)]
+    if any(r['error'] for r in results):
+        print("warning: the script raised during at least one run")
+
+    def median(key):
+        return statistics.median(r[key] for r in results)
+
+    print(f"script               {os.path.relpath(script, ROOT)}")
+    print(f"streamlit import     {median('streamlit_import') * 1000:8.1f} ms")
+    print(f"cold first run       {median('cold') * 1000:8.1f} ms")
+    print(f"warm rerun           {median('warm') * 1000:8.1f} ms")
+    print(f"peak RSS             {median('rss_mb'):8.1f} MiB")
+    print(f"plotly.express       {results[0]['plotly_express']}")
+    print(f"requests             {results[0]['requests']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Local stand-in for the Wikipedia REST summary endpoint.
+
+Serves /page/summary/<Title> with a fixed artificial latency, answers
+If-None-Match with 304, returns 404 for titles starting with "Missing",
+and counts every request it receives.
+
+    python benchmarks/stub_wiki.py [port] [latency_ms]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+SUMMARY_PATH = '/api/rest_v1/page/summary/'
+
+
+class StubWikiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.05):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def summary_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}{SUMMARY_PATH}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        time.sleep(server.latency)
+        if not self.path.startswith(SUMMARY_PATH):
+            return self._send(404, b'')
+        title = unquote(self.path[len(SUMMARY_PATH):]).replace('_', ' ')
+        if title.startswith('Missing'):
+            return self._send(404, b'{}')
+        etag = '"%x"' % (hash(title) & 0xffffffff)
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, b'', etag)
+        body = json.dumps({
+            'title': title,
+            'extract': f"{title} is a topic served by the local stub.",
+            'content_urls': {'desktop': {'page': f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"}},
+        }).encode()
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 50 / 1000
+    server = StubWikiServer(port, latency)
+    print(f"Serving stub summaries at {server.summary_url}")
+    server.serve_forever()
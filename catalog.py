@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import sys
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'topics.jsonl')
+DEFAULT_CATEGORY = 'General'
+LINE_TOPICS = 1000
+
+
+def catalog_path():
+    """EDUWIKI_CATALOG, read at call time so a changed environment takes effect"""
+    return os.environ.get('EDUWIKI_CATALOG', DEFAULT_CATALOG_PATH)
+
+
+class Catalog:
+    """Topic universe with precomputed topic/category lookups.
+
+    On disk the catalog is JSONL with one ``{"category": ..., "topics": [...]}``
+    record per line; large categories are split over several lines, which
+    keeps parsing to a handful of C-level json.loads calls.
+    """
+
+    def __init__(self, categories):
+        self._topics_by_category = {
+            category: tuple(dict.fromkeys(topics)) for category, topics in categories.items()}
+        self._category_by_topic = {}
+        for category, topics in self._topics_by_category.items():
+            for topic in topics:
+                self._category_by_topic.setdefault(topic, category)
+        self.categories = tuple(self._topics_by_category)
+        # Every distinct topic once, in catalog order, for sampling and indexing
+        self.topics = tuple(self._category_by_topic)
+
+    @classmethod
+    def load(cls, path=None):
+        categories = {}
+        with open(path or catalog_path(), encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    categories.setdefault(record['category'], []).extend(record['topics'])
+        return cls(categories)
+
+    def save(self, path=None):
+        with open(path or catalog_path(), 'w', encoding='utf-8') as f:
+            for category, topics in self._topics_by_category.items():
+                for start in range(0, max(len(topics), 1), LINE_TOPICS):
+                    record = {'category': category, 'topics': topics[start:start + LINE_TOPICS]}
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def __len__(self):
+        return len(self.topics)
+
+    def __contains__(self, topic):
+        return topic in self._category_by_topic
+
+    def category_of(self, topic):
+        return self._category_by_topic.get(topic, DEFAULT_CATEGORY)
+
+    def topics_in(self, category):
+        return self._topics_by_category.get(category, ())
+
+    def count(self, category):
+        return len(self.topics_in(category))
+
+    def page(self, category, page, page_size):
+        """Topics on a zero-based page of a category"""
+        start = page * page_size
+        return self.topics_in(category)[start:start + page_size]
+
+    def sample(self, k, rng=random):
+        return rng.sample(self.topics, min(k, len(self.topics)))
+
+
+if __name__ == '__main__':
+    # python catalog.py [path] -- print a summary of a catalog file
+    catalog = Catalog.load(sys.argv[1] if len(sys.argv) > 1 else None)
+    for category in catalog.categories:
+        print(f"{catalog.count(category):>8}  {category}")
+    print(f"{len(catalog):>8}  distinct topics")
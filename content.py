@@ -0,0 +1,109 @@
+import json
+import os
+import random
+import sys
+import threading
+import zlib
+from functools import lru_cache
+
+from i18n import DEFAULT_LANGUAGE, get_translations
+
+CONTENT_PACK_PATH = os.environ.get(
+    'EDUWIKI_CONTENT_PACK',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'content.pack'))
+MEMO_ENTRIES = 4096
+DIFFICULTIES = ['Beginner', 'Intermediate', 'Advanced']
+
+CONTENT_TEMPLATE = """
+    {topic} is a fundamental concept that encompasses various aspects of knowledge and understanding. This field of study involves systematic investigation, analysis, and practical application of principles that have been developed through extensive research and observation.
+    
+    Understanding {topic} is crucial for developing comprehensive knowledge in this field. Students and professionals in related fields benefit from comprehensive understanding of core concepts, methodologies, and current trends that shape this discipline.
+    
+    {topic} has wide-ranging applications in modern society and continues to evolve with new discoveries. From theoretical foundations to practical implementations, this subject area demonstrates significant relevance in solving real-world problems and advancing human knowledge.
+    
+    Current research in {topic} focuses on innovative approaches and technological advancements. Ongoing studies continue to reveal new insights, challenge existing paradigms, and open pathways for innovation and discovery.
+    
+    The future of {topic} holds promising developments that will impact various sectors. Emerging technologies, changing global needs, and interdisciplinary approaches are reshaping the landscape and creating new opportunities for growth and development.
+    """
+
+
+def topic_rng(topic):
+    """Random generator seeded by the topic, stable across runs and processes"""
+    return random.Random(zlib.crc32(topic.encode('utf-8')))
+
+
+def generate_content(topic, category, template=CONTENT_TEMPLATE, name=None):
+    """Generate educational content for a topic; the same topic always gives the same result.
+
+    ``name`` is the (possibly localized) topic name shown in the text.
+    """
+    name = name or topic
+    rng = topic_rng(topic)
+    return {
+        'title': name,
+        'description': f"Comprehensive study of {name}",
+        'content': template.format(topic=name).strip(),
+        'category': category,
+        'difficulty': rng.choice(DIFFICULTIES),
+        'estimated_time': f"{rng.randint(10, 45)} minutes"
+    }
+
+
+class ContentStore:
+    """Per-topic content, read from a prebuilt pack when present, else generated.
+
+    ``get(topic, language)`` localizes names and text through the compiled
+    translations; the pack holds English content only.
+
+    Lookups are memoized in a bounded LRU shared by every caller. Each pack
+    line is the JSON-encoded title, a tab, then the JSON record; only line
+    offsets are kept in memory and records are read on demand.
+    """
+
+    def __init__(self, catalog, pack_path=CONTENT_PACK_PATH, memo_entries=MEMO_ENTRIES):
+        self.catalog = catalog
+        self._offsets = {}
+        self._pack = None
+        self._lock = threading.Lock()
+        if pack_path and os.path.exists(pack_path):
+            self._pack = open(pack_path, 'rb')
+            offset = 0
+            for line in self._pack:
+                self._offsets[json.loads(line[:line.index(b'\t')])] = offset
+                offset += len(line)
+        self.get = lru_cache(maxsize=memo_entries)(self._load)
+
+    def _load(self, topic, language=DEFAULT_LANGUAGE):
+        if language != DEFAULT_LANGUAGE:
+            translations = get_translations(language)
+            return generate_content(
+                topic, translations.category(self.catalog.category_of(topic)),
+                translations.content or CONTENT_TEMPLATE, translations.topic(topic))
+        offset = self._offsets.get(topic)
+        if offset is None:
+            return generate_content(topic, self.catalog.category_of(topic))
+        with self._lock:
+            self._pack.seek(offset)
+            line = self._pack.readline()
+        return json.loads(line[line.index(b'\t') + 1:])
+
+    def __contains__(self, topic):
+        return topic in self._offsets
+
+
+def build_content_pack(catalog, path=CONTENT_PACK_PATH):
+    """Precompute content for every catalog topic into a pack file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for topic in catalog.topics:
+            record = generate_content(topic, catalog.category_of(topic))
+            f.write(json.dumps(topic, ensure_ascii=False) + '\t' + json.dumps(record, ensure_ascii=False) + '\n')
+    return len(catalog)
+
+
+if __name__ == '__main__':
+    # python content.py build [pack_path]
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        sys.exit("usage: python content.py build [pack_path]")
+    from catalog import Catalog
+    path = sys.argv[2] if len(sys.argv) > 2 else CONTENT_PACK_PATH
+    print(f"Wrote {build_content_pack(Catalog.load(), path)} topics to {path}")
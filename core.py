@@ -0,0 +1,113 @@
+import random
+import threading
+
+from articles import ArticlePack
+from catalog import Catalog
+from content import ContentStore
+from i18n import DEFAULT_LANGUAGE
+from quiz import QUIZ_LENGTH, QuizBank, grade_quiz, grade_submissions
+from search import SearchIndex
+
+
+class EduWiki:
+    """Search, content, quizzes and summaries without any UI.
+
+    Resources are built on first use and shared by every caller and thread;
+    the Streamlit app and the HTTP service each keep one instance per
+    process. ``requests`` is only imported once a summary has to be fetched.
+    """
+
+    def __init__(self, catalog=None):
+        self._resources = {}
+        if catalog is not None:
+            self._resources['catalog'] = catalog
+        self._lock = threading.RLock()
+
+    def _resource(self, name, build):
+        try:
+            return self._resources[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._resources:
+                self._resources[name] = build()
+            return self._resources[name]
+
+    def loaded(self, name):
+        """The named resource if it has been built, else None"""
+        return self._resources.get(name)
+
+    @property
+    def catalog(self):
+        return self._resource('catalog', Catalog.load)
+
+    @property
+    def search_index(self):
+        return self._resource('search_index', lambda: SearchIndex(self.catalog.topics))
+
+    @property
+    def content_store(self):
+        return self._resource('content_store', lambda: ContentStore(self.catalog))
+
+    @property
+    def quiz_bank(self):
+        return self._resource('quiz_bank', lambda: QuizBank.load_or_build(self.catalog))
+
+    @property
+    def article_pack(self):
+        """Offline article pack, or None if none was imported"""
+        return self._resource('article_pack', ArticlePack.open_if_exists)
+
+    @property
+    def wiki_cache(self):
+        def build():
+            from wiki import WikiCache
+            return WikiCache()
+        return self._resource('wiki_cache', build)
+
+    @property
+    def fetcher(self):
+        def build():
+            from fetcher import Fetcher
+            return Fetcher()
+        return self._resource('fetcher', build)
+
+    def warm(self):
+        """Build every local resource now rather than on first use"""
+        self.search_index
+        self.content_store
+        self.quiz_bank
+        self.article_pack
+
+    def search(self, query, limit=20):
+        return self.search_index.search(query, limit)
+
+    def category(self, topic):
+        return self.catalog.category_of(topic)
+
+    def content(self, topic, language=DEFAULT_LANGUAGE):
+        return self.content_store.get(topic, language)
+
+    def quiz(self, topic, k=QUIZ_LENGTH, rng=random):
+        return self.quiz_bank.sample(topic, k, rng)
+
+    def grade(self, questions, answers):
+        """(score, total) for one submission"""
+        return grade_quiz(questions, answers)
+
+    def grade_many(self, questions, submissions):
+        return grade_submissions(questions, submissions)
+
+    def summary(self, topic):
+        """Article from the offline pack when it has one, else the Wikipedia summary.
+
+        May block on the network; pack thumbnails are returned as bytes.
+        """
+        pack = self.article_pack
+        article = pack.get(topic) if pack is not None else None
+        if article is not None:
+            if isinstance(article['image'], memoryview):
+                article['image'] = bytes(article['image'])
+            return article
+        from wiki import get_wikipedia_summary
+        return get_wikipedia_summary(topic, self.wiki_cache, fetcher=self.fetcher)
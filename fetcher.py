@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_CONNECTIONS = 8
+TIMEOUT = 5
+
+
+class Fetcher:
+    """Pooled HTTP client with bounded concurrency and request coalescing.
+
+    One instance is meant to be shared by every session of the server:
+    connections are kept alive in the session pool, at most
+    ``max_connections`` requests are upstream at once, and concurrent
+    ``coalesce`` calls with the same key share a single result.
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'EduWiki-Offline/1.0'
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._pool = ThreadPoolExecutor(max_connections, thread_name_prefix='eduwiki-fetch')
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.upstream_requests = 0
+        self.coalesced_requests = 0
+
+    def get(self, url, headers=None):
+        with self._slots:
+            with self._lock:
+                self.upstream_requests += 1
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def coalesce(self, key, fn):
+        """Run ``fn()`` once for all concurrent callers using the same key"""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced_requests += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def map(self, fn, items):
+        """Apply ``fn`` to every item in parallel, preserving order"""
+        return list(self._pool.map(fn, items))
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def default_fetcher():
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher()
+        return _default_fetcher
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LOCALES_DIR = os.path.join(ROOT, 'locales')
+COMPILED_DIR = os.environ.get('EDUWIKI_I18N', os.path.join(ROOT, 'data', 'i18n'))
+DEFAULT_LANGUAGE = 'en'
+LANGUAGES = {'en': '🇬🇧 English', 'hi': '🇮🇳 हिंदी', 'ta': '🇮🇳 தமிழ்', 'bn': '🇮🇳 বাংলা', 'te': '🇮🇳 తెలుగు', 'mr': '🇮🇳 मराठी', 'gu': '🇮🇳 ગુજરાતી'}
+
+
+class Translations:
+    """Compiled strings for one language.
+
+    UI labels already include the English fallbacks, so every lookup is a
+    single dict hit. Category and topic names fall back to the English name.
+    ``content`` is a localized content template (with a ``{topic}``
+    placeholder) or None.
+    """
+
+    __slots__ = ('language', 'ui', 'categories', 'topics', 'content')
+
+    def __init__(self, language, ui, categories=None, topics=None, content=None):
+        self.language = language
+        self.ui = ui
+        self.categories = categories or {}
+        self.topics = topics or {}
+        self.content = content
+
+    def t(self, key):
+        return self.ui.get(key, key)
+
+    def category(self, name):
+        return self.categories.get(name, name)
+
+    def topic(self, name):
+        return self.topics.get(name, name)
+
+
+def _read_source(language):
+    with open(os.path.join(LOCALES_DIR, f"{language}.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compile_language(language):
+    """Merge a source catalog with its English fallbacks into a runtime table"""
+    source = _read_source(language)
+    ui = dict(source.get('ui', {}))
+    if language != DEFAULT_LANGUAGE:
+        ui = {**_read_source(DEFAULT_LANGUAGE).get('ui', {}), **ui}
+    content = source.get('content')
+    if content is not None and '{topic}' not in content:
+        raise ValueError(f"{language}: content template has no {{topic}} placeholder")
+    return {'ui': ui, 'categories': source.get('categories', {}), 'topics': source.get('topics', {}),
+            'content': content}
+
+
+def build(languages=LANGUAGES):
+    """Compile every language into COMPILED_DIR"""
+    os.makedirs(COMPILED_DIR, exist_ok=True)
+    for language in languages:
+        with open(os.path.join(COMPILED_DIR, f"{language}.json"), 'w', encoding='utf-8') as f:
+            json.dump(compile_language(language), f, ensure_ascii=False, separators=(',', ':'))
+
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def get_translations(language):
+    """Translations for one language, loaded on first use and shared process-wide"""
+    translations = _loaded.get(language)
+    if translations is None:
+        if language not in LANGUAGES:
+            language = DEFAULT_LANGUAGE
+        with _lock:
+            translations = _loaded.get(language)
+            if translations is None:
+                compiled = os.path.join(COMPILED_DIR, f"{language}.json")
+                if os.path.exists(compiled):
+                    with open(compiled, encoding='utf-8') as f:
+                        table = json.load(f)
+                else:
+                    table = compile_language(language)
+                translations = _loaded[language] = Translations(language, **table)
+    return translations
+
+
+if __name__ == '__main__':
+    # python i18n.py build
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        sys.exit("usage: python i18n.py build")
+    build()
+    print(f"Compiled {len(LANGUAGES)} languages into {COMPILED_DIR}")
@@ -0,0 +1,170 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+# Off unless EDUWIKI_METRICS is set; when off, timed() hands back the
+# undecorated function and timer()/count() do nothing.
+ENABLED = os.environ.get('EDUWIKI_METRICS', '') not in ('', '0')
+# Export target: *.json for JSON, anything else for Prometheus text format
+# (e.g. a node_exporter textfile collector directory)
+METRICS_PATH = os.environ.get('EDUWIKI_METRICS_FILE', '')
+EXPORT_INTERVAL = 10
+
+
+class Metrics:
+    """Process-wide counters and timings, plus a per-thread rerun breakdown.
+
+    Streamlit runs each session's script on its own thread, so timings
+    observed between ``begin_rerun`` and ``rerun_breakdown`` on that thread
+    belong to that rerun.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.timings = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._exported = 0.0
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                self.timings[name] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = max(timing[2], seconds)
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is not None:
+            rerun[name] = rerun.get(name, 0.0) + seconds
+
+    def gauge(self, name, fn):
+        """Report ``fn()`` under ``name`` whenever metrics are read"""
+        self._gauges[name] = fn
+
+    def begin_rerun(self):
+        self._local.rerun = {}
+        self._local.started = time.perf_counter()
+
+    def rerun_breakdown(self):
+        """(total seconds, {name: seconds}) for this thread's current rerun"""
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is None:
+            return 0.0, {}
+        return time.perf_counter() - self._local.started, dict(rerun)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+            timings = {name: {'count': count, 'total': total, 'max': longest}
+                       for name, (count, total, longest) in self.timings.items()}
+        gauges = {}
+        for name, fn in list(self._gauges.items()):
+            try:
+                gauges[name] = fn()
+            except Exception:
+                continue
+        return {'counters': counters, 'timings': timings, 'gauges': gauges}
+
+    def to_prometheus(self):
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = _metric_name(name) + '_total'
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, timing in sorted(snapshot['timings'].items()):
+            metric = _metric_name(name) + '_seconds'
+            lines += [f"# TYPE {metric} summary", f"{metric}_count {timing['count']}",
+                      f"{metric}_sum {timing['total']:.6f}",
+                      f"# TYPE {metric}_max gauge", f"{metric}_max {timing['max']:.6f}"]
+        for name, value in sorted(snapshot['gauges'].items()):
+            metric = _metric_name(name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path=METRICS_PATH):
+        """Write every metric to ``path`` atomically"""
+        if path.endswith('.json'):
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        # A private temp file per export, so concurrent exports can't interleave
+        fd, tmp = tempfile.mkstemp(prefix='.metrics-', dir=os.path.dirname(path) or '.')
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def export_if_due(self, path=METRICS_PATH, interval=EXPORT_INTERVAL):
+        """Export at most once per ``interval`` seconds; a no-op without a path"""
+        if not path:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._exported < interval:
+                return
+            self._exported = now
+        self.export(path)
+
+
+def _metric_name(name):
+    return 'eduwiki_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+metrics = Metrics()
+
+
+class _Timer:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        metrics.observe(self.name, time.perf_counter() - self.started)
+
+
+_NULL_TIMER = nullcontext()
+
+
+def timer(name):
+    """Context manager timing its body under ``name``"""
+    return _Timer(name) if ENABLED else _NULL_TIMER
+
+
+def timed(name):
+    """Decorator timing every call under ``name``"""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    if ENABLED:
+        metrics.count(name, n)
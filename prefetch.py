@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+WORKERS = 2
+MAX_PENDING = 64
+WARM_KEYS = 4096
+# The warmed caches expire and evict entries without telling us, so a key
+# only counts as warm for this long after its task last produced a result
+WARM_TTL = 600
+
+
+class Prefetcher:
+    """Warms caches in the background ahead of likely navigation.
+
+    Work is scheduled per owner (a learner or session). Scheduling again for
+    the same owner removes whatever it still had queued, so navigating away
+    frees the queue for current work. The queue is bounded; tasks that don't
+    fit are dropped rather than blocking the rerun. A task that returns None
+    warmed nothing, so it counts as failed and its key stays cold.
+    """
+
+    def __init__(self, workers=WORKERS, max_pending=MAX_PENDING, warm_keys=WARM_KEYS, warm_ttl=WARM_TTL):
+        self._pending = deque()
+        self._max_pending = max_pending
+        self._warm = OrderedDict()
+        self._warm_keys = warm_keys
+        self._warm_ttl = warm_ttl
+        self._ready = threading.Condition()
+        self.counters = dict.fromkeys(('scheduled', 'completed', 'cancelled', 'dropped', 'failed', 'hits', 'misses'), 0)
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"eduwiki-prefetch-{i}", daemon=True).start()
+
+    def schedule(self, owner, tasks):
+        """Replace ``owner``'s pending work with ``tasks``, an iterable of (key, fn)"""
+        with self._ready:
+            self._cancel(owner)
+            queued = {key for _, key, _ in self._pending}
+            for key, fn in tasks:
+                if self._is_warm(key) or key in queued:
+                    continue
+                if len(self._pending) >= self._max_pending:
+                    self.counters['dropped'] += 1
+                    continue
+                self._pending.append((owner, key, fn))
+                queued.add(key)
+                self.counters['scheduled'] += 1
+            self._ready.notify_all()
+
+    def cancel(self, owner):
+        with self._ready:
+            self._cancel(owner)
+
+    def _cancel(self, owner):
+        kept = [task for task in self._pending if task[0] != owner]
+        self.counters['cancelled'] += len(self._pending) - len(kept)
+        self._pending = deque(kept)
+
+    def record(self, key):
+        """Note a foreground use of ``key``: a hit if prefetch already warmed it"""
+        with self._ready:
+            hit = self._is_warm(key)
+            self.counters['hits' if hit else 'misses'] += 1
+        return hit
+
+    def _is_warm(self, key):
+        expires = self._warm.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._warm[key]
+            return False
+        return True
+
+    @property
+    def hit_rate(self):
+        used = self.counters['hits'] + self.counters['misses']
+        return self.counters['hits'] / used if used else 0.0
+
+    def stats(self):
+        with self._ready:
+            return dict(self.counters, pending=len(self._pending), hit_rate=self.hit_rate)
+
+    def _work(self):
+        while True:
+            with self._ready:
+                self._ready.wait_for(lambda: self._pending)
+                _, key, fn = self._pending.popleft()
+            try:
+                result = fn()
+            except Exception:
+                logging.getLogger(__name__).exception("Prefetch of %r failed", key)
+                result = None
+            with self._ready:
+                if result is None:
+                    self.counters['failed'] += 1
+                    continue
+                self.counters['completed'] += 1
+                self._warm[key] = time.monotonic() + self._warm_ttl
+                self._warm.move_to_end(key)
+                while len(self._warm) > self._warm_keys:
+                    self._warm.popitem(last=False)
@@ -0,0 +1,224 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+
+from analytics import QuizStats
+
+PROGRESS_PATH = os.environ.get(
+    'EDUWIKI_PROGRESS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'progress.sqlite3'))
+
+# Per-session memory bounds; the database keeps every row
+HISTORY_LIMIT = 100
+QUIZ_LIMIT = 500
+
+# Write-behind batching
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.5
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS learners ('
+    'learner TEXT PRIMARY KEY, score INTEGER NOT NULL DEFAULT 0, '
+    'topics_studied INTEGER NOT NULL DEFAULT 0, quizzes_taken INTEGER NOT NULL DEFAULT 0)',
+    'CREATE TABLE IF NOT EXISTS bookmarks ('
+    'learner TEXT NOT NULL, topic TEXT NOT NULL, added REAL NOT NULL, PRIMARY KEY (learner, topic))',
+    'CREATE TABLE IF NOT EXISTS quiz_scores ('
+    'id INTEGER PRIMARY KEY, learner TEXT NOT NULL, topic TEXT NOT NULL, '
+    'score REAL NOT NULL, points INTEGER NOT NULL, date TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS quiz_scores_learner ON quiz_scores (learner, id)',
+    'CREATE TABLE IF NOT EXISTS history ('
+    'id INTEGER PRIMARY KEY, learner TEXT NOT NULL, topic TEXT NOT NULL, date TEXT NOT NULL, points INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS history_learner ON history (learner, id)',
+]
+
+_ENSURE_LEARNER = 'INSERT OR IGNORE INTO learners (learner) VALUES (?)'
+
+
+class ProgressStore:
+    """Learner progress in SQLite (WAL mode) behind a write-behind queue.
+
+    Reads go straight to the database; writes are queued and applied by a
+    single writer thread in batched transactions. Each queued group of
+    statements runs under its own savepoint, so one failing group is rolled
+    back alone. Pending writes are counted per learner, so loading a learner
+    only waits for that learner's writes.
+    """
+
+    def __init__(self, path=PROGRESS_PATH):
+        self.path = path
+        self._read_lock = threading.Lock()
+        self._reader = self._connect()
+        for statement in _SCHEMA:
+            self._reader.execute(statement)
+        self._reader.commit()
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._written = threading.Condition()
+        self._writer = threading.Thread(target=self._write_loop, name='eduwiki-progress', daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect(self, isolation_level=''):
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=isolation_level)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return db
+
+    def load(self, learner):
+        """Hydrate a learner's progress (most recent rows only)"""
+        self.flush(learner)
+        with self._read_lock:
+            row = self._reader.execute(
+                'SELECT score, topics_studied, quizzes_taken FROM learners WHERE learner = ?',
+                (learner,)).fetchone()
+            bookmarks = self._reader.execute(
+                'SELECT topic FROM bookmarks WHERE learner = ? ORDER BY added', (learner,)).fetchall()
+            quiz_scores = self._reader.execute(
+                'SELECT topic, score, points, date FROM quiz_scores WHERE learner = ? ORDER BY id DESC LIMIT ?',
+                (learner, QUIZ_LIMIT)).fetchall()
+            history = self._reader.execute(
+                'SELECT topic, date, points FROM history WHERE learner = ? ORDER BY id DESC LIMIT ?',
+                (learner, HISTORY_LIMIT)).fetchall()
+            by_day = self._reader.execute(
+                'SELECT date, COUNT(*), SUM(score), SUM(points) FROM quiz_scores WHERE learner = ? GROUP BY date',
+                (learner,)).fetchall()
+            by_topic = self._reader.execute(
+                'SELECT topic, COUNT(*), SUM(score) FROM quiz_scores WHERE learner = ? GROUP BY topic',
+                (learner,)).fetchall()
+        score, topics_studied, quizzes_taken = row or (0, 0, 0)
+        stats = QuizStats.from_aggregates(
+            {day: (count, score_sum, points) for day, count, score_sum, points in by_day},
+            {topic: (count, score_sum) for topic, count, score_sum in by_topic},
+            [score for _, score, _, _ in reversed(quiz_scores)])
+        return LearnerProgress(
+            self, learner, score=score, topics_studied=topics_studied, quizzes_taken=quizzes_taken,
+            bookmarks=[topic for topic, in bookmarks],
+            quiz_scores=[{'topic': topic, 'score': score, 'points': points, 'date': date}
+                         for topic, score, points, date in reversed(quiz_scores)],
+            learning_history=[{'topic': topic, 'date': datetime.fromisoformat(date), 'points': points}
+                              for topic, date, points in reversed(history)],
+            stats=stats)
+
+    def write(self, learner, *statements):
+        """Queue (sql, params) statements for ``learner`` to be applied together"""
+        with self._written:
+            self._pending[learner] = self._pending.get(learner, 0) + 1
+        self._queue.put((learner, statements))
+
+    def flush(self, learner=None):
+        """Block until ``learner``'s queued writes (or everyone's) have been committed"""
+        if learner is None:
+            self._queue.join()
+            return
+        with self._written:
+            self._written.wait_for(lambda: learner not in self._pending)
+
+    def _write_loop(self):
+        # Transactions are managed explicitly so groups can use savepoints
+        db = self._connect(isolation_level=None)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                db.execute('BEGIN')
+                for learner, statements in batch:
+                    db.execute('SAVEPOINT write_group')
+                    try:
+                        for sql, params in statements:
+                            db.execute(sql, params)
+                    except sqlite3.Error:
+                        db.execute('ROLLBACK TO write_group')
+                        logging.getLogger(__name__).exception("Dropped a progress write for %s", learner)
+                    db.execute('RELEASE write_group')
+                db.execute('COMMIT')
+            except sqlite3.Error:
+                if db.in_transaction:
+                    db.execute('ROLLBACK')
+                logging.getLogger(__name__).exception("Dropped a batch of %d progress writes", len(batch))
+            finally:
+                with self._written:
+                    for learner, _ in batch:
+                        self._pending[learner] -= 1
+                        if not self._pending[learner]:
+                            del self._pending[learner]
+                    self._written.notify_all()
+                for _ in batch:
+                    self._queue.task_done()
+
+
+class LearnerProgress:
+    """One learner's progress as kept in session state; changes write through to the store"""
+
+    def __init__(self, store, learner, score=0, topics_studied=0, quizzes_taken=0,
+                 bookmarks=(), quiz_scores=(), learning_history=(), stats=None):
+        self.store = store
+        self.learner = learner
+        self.score = score
+        self.topics_studied = topics_studied
+        self.quizzes_taken = quizzes_taken
+        # Insertion-ordered set
+        self.bookmarks = dict.fromkeys(bookmarks)
+        self.quiz_scores = list(quiz_scores)
+        self.learning_history = list(learning_history)
+        self.stats = stats or QuizStats()
+
+    def recent_bookmarks(self, n):
+        return list(islice(reversed(self.bookmarks), n))[::-1]
+
+    def add_bookmark(self, topic):
+        """Bookmark a topic; returns False if it already was"""
+        if topic in self.bookmarks:
+            return False
+        self.bookmarks[topic] = None
+        self.store.write(
+            self.learner,
+            (_ENSURE_LEARNER, (self.learner,)),
+            ('INSERT OR IGNORE INTO bookmarks (learner, topic, added) VALUES (?, ?, ?)',
+             (self.learner, topic, time.time())))
+        return True
+
+    def complete_topic(self, topic, points):
+        now = datetime.now()
+        self.score += points
+        self.topics_studied += 1
+        _append_bounded(self.learning_history, {'topic': topic, 'date': now, 'points': points}, HISTORY_LIMIT)
+        self.store.write(
+            self.learner,
+            (_ENSURE_LEARNER, (self.learner,)),
+            ('UPDATE learners SET score = score + ?, topics_studied = topics_studied + 1 WHERE learner = ?',
+             (points, self.learner)),
+            ('INSERT INTO history (learner, topic, date, points) VALUES (?, ?, ?, ?)',
+             (self.learner, topic, now.isoformat(), points)))
+
+    def add_quiz_score(self, topic, score, points):
+        """Record a quiz result (``score`` in percent) and award its points"""
+        date = datetime.now().strftime("%Y-%m-%d")
+        self.score += points
+        self.quizzes_taken += 1
+        self.stats.add(topic, score, points, date)
+        _append_bounded(self.quiz_scores, {'topic': topic, 'score': score, 'points': points, 'date': date},
+                        QUIZ_LIMIT)
+        self.store.write(
+            self.learner,
+            (_ENSURE_LEARNER, (self.learner,)),
+            ('UPDATE learners SET score = score + ?, quizzes_taken = quizzes_taken + 1 WHERE learner = ?',
+             (points, self.learner)),
+            ('INSERT INTO quiz_scores (learner, topic, score, points, date) VALUES (?, ?, ?, ?, ?)',
+             (self.learner, topic, score, points, date)))
+
+
+def _append_bounded(items, item, limit):
+    items.append(item)
+    if len(items) > limit:
+        del items[:len(items) - limit]
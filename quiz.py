@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import random
+import sys
+import zlib
+from functools import lru_cache
+from itertools import permutations
+
+QUIZ_BANK_PATH = os.environ.get(
+    'EDUWIKI_QUIZ_BANK',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'quiz.bank'))
+QUIZ_LENGTH = 3
+
+QUESTION_TEMPLATES = [
+    "What is the primary focus of {topic}?",
+    "Which field is most closely related to {topic}?",
+    "What are the main applications of {topic}?",
+    "How does {topic} contribute to modern society?",
+    "What skills are essential for understanding {topic}?"
+]
+MCQ_OPTIONS = ['Innovation and Research', 'Practical Applications', 'Theoretical Framework', 'Historical Development']
+FILL_TEMPLATE = "The study of {topic} primarily involves _____ and analysis."
+FILL_ANSWER = 'research'
+
+# Templates pre-split around {topic} so sampling only concatenates
+_TEMPLATE_PARTS = [tuple(template.split('{topic}')) for template in QUESTION_TEMPLATES]
+_FILL_PARTS = tuple(FILL_TEMPLATE.split('{topic}'))
+
+
+@lru_cache(maxsize=None)
+def _template_draws(k):
+    """Every ordered choice of k distinct templates, so a draw is one rng.choice"""
+    return tuple(permutations(range(len(QUESTION_TEMPLATES)), min(k, len(QUESTION_TEMPLATES))))
+
+
+def normalize_answer(answer):
+    return answer.lower().strip() if isinstance(answer, str) else ''
+
+
+class QuizBank:
+    """Pregenerated answer keys for every catalog topic.
+
+    For each topic the bank stores one byte per question template: the index
+    of the correct option. Question text is formatted only for the k questions
+    actually drawn, so sampling a quiz is O(k).
+    """
+
+    def __init__(self, topics, answers):
+        self.topics = tuple(topics)
+        self._ids = {topic: tid for tid, topic in enumerate(self.topics)}
+        self._answers = answers
+
+    @classmethod
+    def build(cls, topics):
+        topics = list(topics)
+        answers = bytearray()
+        for topic in topics:
+            answers.extend(_answer_indices(topic))
+        return cls(topics, bytes(answers))
+
+    @classmethod
+    def load(cls, path=QUIZ_BANK_PATH):
+        """Read a saved bank; ValueError if it was built for other templates or options"""
+        with open(path, 'rb') as f:
+            try:
+                header = json.loads(f.readline())
+                templates, options, topics = header['templates'], header['options'], header['topics']
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"{path} is not a quiz bank") from None
+            answers = f.read()
+        if templates != len(QUESTION_TEMPLATES) or options != len(MCQ_OPTIONS):
+            raise ValueError(f"{path} was built for {templates} templates and {options} options, "
+                             f"not {len(QUESTION_TEMPLATES)} and {len(MCQ_OPTIONS)}")
+        if len(answers) != len(topics) * templates or any(answer >= options for answer in answers):
+            raise ValueError(f"{path} has a corrupt answer table")
+        return cls(topics, answers)
+
+    @classmethod
+    def load_or_build(cls, catalog, path=QUIZ_BANK_PATH):
+        """The saved bank, or a fresh one when it is missing or stale"""
+        if os.path.exists(path):
+            try:
+                return cls.load(path)
+            except ValueError as error:
+                logging.getLogger(__name__).warning("Rebuilding quiz bank: %s", error)
+        return cls.build(catalog.topics)
+
+    def save(self, path=QUIZ_BANK_PATH):
+        with open(path, 'wb') as f:
+            header = {'templates': len(QUESTION_TEMPLATES), 'options': len(MCQ_OPTIONS), 'topics': self.topics}
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            f.write(self._answers)
+
+    def __len__(self):
+        return len(self.topics)
+
+    def answer_indices(self, topic):
+        tid = self._ids.get(topic)
+        if tid is None:
+            return _answer_indices(topic)
+        width = len(QUESTION_TEMPLATES)
+        return self._answers[tid * width:(tid + 1) * width]
+
+    def sample(self, topic, k=QUIZ_LENGTH, rng=random):
+        """Draw a quiz: multiple-choice questions with a fill-in every other slot"""
+        answers = self.answer_indices(topic)
+        questions = []
+        for i, template in enumerate(rng.choice(_template_draws(k))):
+            if i % 2 == 0:
+                answer = MCQ_OPTIONS[answers[template]]
+                prefix, suffix = _TEMPLATE_PARTS[template]
+                questions.append({
+                    'question': prefix + topic + suffix,
+                    'options': MCQ_OPTIONS,
+                    'answer': answer,
+                    'key': answer,
+                    'type': 'mcq',
+                    'points': 15
+                })
+            else:
+                questions.append({
+                    'question': _FILL_PARTS[0] + topic + _FILL_PARTS[1],
+                    'answer': FILL_ANSWER,
+                    'key': FILL_ANSWER,
+                    'type': 'fill',
+                    'points': 10
+                })
+        return questions
+
+
+def _answer_indices(topic):
+    # Digits of a stable hash in base len(MCQ_OPTIONS): one per template
+    h = zlib.crc32(topic.encode('utf-8'))
+    n = len(MCQ_OPTIONS)
+    return bytes(h // n ** j % n for j in range(len(QUESTION_TEMPLATES)))
+
+
+def answer_key(questions):
+    """Precompute (keys, fill flags, points, total) for grading a quiz"""
+    keys = tuple(q['key'] for q in questions)
+    fills = tuple(q['type'] == 'fill' for q in questions)
+    points = tuple(q['points'] for q in questions)
+    return keys, fills, points, sum(points)
+
+
+def grade_quiz(questions, answers):
+    """Score one submission; ``answers`` lines up with ``questions``. Returns (score, total)
+
+    ``total`` covers every question; a missing answer scores nothing.
+    """
+    score = 0
+    total = sum(q['points'] for q in questions)
+    for q, answer in zip(questions, answers):
+        if (normalize_answer(answer) if q['type'] == 'fill' else answer) == q['key']:
+            score += q['points']
+    return score, total
+
+
+def grade_submissions(questions, submissions):
+    """Score many submissions of the same quiz, e.g. a whole class; returns [(score, total)]"""
+    keys, fills, points, total = answer_key(questions)
+    results = []
+    for answers in submissions:
+        score = 0
+        for key, fill, value, answer in zip(keys, fills, points, answers):
+            if (normalize_answer(answer) if fill else answer) == key:
+                score += value
+        results.append((score, total))
+    return results
+
+
+if __name__ == '__main__':
+    # python quiz.py build [bank_path]
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        sys.exit("usage: python quiz.py build [bank_path]")
+    from catalog import Catalog
+    path = sys.argv[2] if len(sys.argv) > 2 else QUIZ_BANK_PATH
+    bank = QuizBank.build(Catalog.load().topics)
+    bank.save(path)
+    print(f"Wrote answer keys for {len(bank)} topics to {path}")
@@ -0,0 +1,183 @@
+import re
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+RESULT_LIMIT = 20
+
+_WORD = re.compile(r'\w+')
+
+# Spelling variants that show up when Indic words are typed in Latin script
+# (and a few plain English ones), folded so e.g. "aayurved", "ayurveda" and
+# "ayurvedha" share one key.
+_PHONETIC_FOLDS = [
+    ('aa', 'a'), ('ee', 'i'), ('oo', 'u'), ('ph', 'f'), ('sh', 's'), ('kh', 'k'), ('gh', 'g'),
+    ('ch', 'c'), ('th', 't'), ('dh', 'd'), ('bh', 'b'), ('jh', 'j'), ('w', 'v'), ('z', 'j'),
+    ('y', 'i'), ('q', 'k'), ('c', 'k'), ('x', 'ks'),
+]
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+def phonetic_key(word):
+    """Fold spelling and transliteration variants of a lowercase word"""
+    for old, new in _PHONETIC_FOLDS:
+        word = word.replace(old, new)
+    folded = []
+    for ch in word:
+        if not folded or folded[-1] != ch:
+            folded.append(ch)
+    key = ''.join(folded)
+    return key[:-1] if len(key) > 3 and key.endswith('a') else key
+
+
+def _deletes(key):
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _within_one_edit(a, b):
+    """True if a and b are at most one insert, delete, substitute or adjacent swap apart"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        # Not a substitution at the last position, so a[i + 1] exists
+        return a[i + 2:] == b[i + 2:] and a[i] == b[i + 1] and a[i + 1] == b[i]
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+def _prefix_range(sorted_keys, prefix):
+    start = bisect_left(sorted_keys, prefix)
+    end = start
+    while end < len(sorted_keys) and sorted_keys[end].startswith(prefix):
+        end += 1
+    return sorted_keys[start:end]
+
+
+class SearchIndex:
+    """Ranked topic search over prebuilt token, trigram and phonetic postings.
+
+    Results are ordered exact name, name prefix, all query words as word
+    prefixes, substring, any query word as a substring, then phonetic/typo
+    matches, each tier in catalog order.
+    """
+
+    def __init__(self, topics):
+        self.topics = list(dict.fromkeys(topics))
+        self._names = [topic.lower() for topic in self.topics]
+        self._exact = {}
+        tokens = defaultdict(list)
+        keys = defaultdict(list)
+        grams = defaultdict(list)
+        for tid, name in enumerate(self._names):
+            self._exact.setdefault(name, tid)
+            for token in dict.fromkeys(tokenize(name)):
+                tokens[token].append(tid)
+                keys[phonetic_key(token)].append(tid)
+            for gram in dict.fromkeys(name[i:i + 3] for i in range(len(name) - 2)):
+                grams[gram].append(tid)
+
+        # Sorted token lists serve as a compact prefix trie over the postings
+        self._tokens = sorted(tokens)
+        self._token_ids = {token: array('I', ids) for token, ids in tokens.items()}
+        self._keys = sorted(keys)
+        self._key_ids = {key: array('I', sorted(set(ids))) for key, ids in keys.items()}
+        self._gram_ids = {gram: array('I', ids) for gram, ids in grams.items()}
+        self._key_deletes = defaultdict(list)
+        for key in self._keys:
+            for variant in _deletes(key):
+                self._key_deletes[variant].append(key)
+
+    def __len__(self):
+        return len(self.topics)
+
+    def search(self, query, limit=RESULT_LIMIT):
+        query = query.lower().strip() if query else ''
+        if not query:
+            return []
+        words = list(dict.fromkeys(tokenize(query)))
+        ranked = []
+        seen = set()
+
+        def add(ids):
+            for tid in ids:
+                if tid not in seen:
+                    seen.add(tid)
+                    ranked.append(tid)
+                    if len(ranked) >= limit:
+                        return True
+            return False
+
+        exact = self._exact.get(query)
+        if exact is not None and add([exact]):
+            return self._topics(ranked)
+
+        if words:
+            matches = sorted(set.intersection(*(self._prefix_ids(word) for word in words)))
+            if add(tid for tid in matches if self._names[tid].startswith(query)) or add(matches):
+                return self._topics(ranked)
+
+        if add(self._substring_ids(query)):
+            return self._topics(ranked)
+
+        # Any whitespace-separated word anywhere in the name, as the old scan did
+        parts = dict.fromkeys(query.split())
+        if add(sorted(set().union(*(self._substring_ids(part) for part in parts)))):
+            return self._topics(ranked)
+
+        add(self._fuzzy_ids(words))
+        return self._topics(ranked)
+
+    def _topics(self, ids):
+        return [self.topics[tid] for tid in ids]
+
+    def _prefix_ids(self, prefix):
+        ids = set()
+        for token in _prefix_range(self._tokens, prefix):
+            ids.update(self._token_ids[token])
+        return ids
+
+    def _substring_ids(self, query):
+        if len(query) < 3:
+            return (tid for tid, name in enumerate(self._names) if query in name)
+        postings = []
+        for gram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            ids = self._gram_ids.get(gram)
+            if ids is None:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return (tid for tid in sorted(candidates) if query in self._names[tid])
+
+    def _fuzzy_ids(self, words):
+        """Topics matching query words phonetically or within one edit"""
+        scores = defaultdict(int)
+        for word in words:
+            key = phonetic_key(word)
+            if len(key) < 3:
+                continue
+            close = set(_prefix_range(self._keys, key))
+            # Shared deletes only narrow the candidates: two keys can share
+            # one and still be two edits apart
+            for variant in _deletes(key) | {key}:
+                close.update(other for other in self._key_deletes.get(variant, ())
+                             if _within_one_edit(key, other))
+                if variant in self._key_ids:
+                    close.add(variant)
+            matched = set()
+            for candidate in close:
+                matched.update(self._key_ids[candidate])
+            for tid in matched:
+                scores[tid] += 1
+        return sorted(scores, key=lambda tid: (-scores[tid], tid))
@@ -0,0 +1,415 @@
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import sys
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from core import EduWiki
+from i18n import DEFAULT_LANGUAGE, LANGUAGES
+from quiz import QUESTION_TEMPLATES, QUIZ_LENGTH
+
+HOST = os.environ.get('EDUWIKI_HOST', '127.0.0.1')
+PORT = int(os.environ.get('EDUWIKI_PORT', '8600'))
+RESPONSE_CACHE_ENTRIES = 4096
+CACHE_MAX_AGE = 300
+KEEP_ALIVE_TIMEOUT = 30
+MAX_BODY = 1 << 20
+MAX_BATCH = 1000
+MAX_SEARCH_LIMIT = 100
+SUMMARY_WORKERS = 16
+BATCH_FIELDS = ('category', 'content', 'quiz', 'summary')
+QUESTION_TYPES = ('mcq', 'fill')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Service:
+    """JSON over HTTP/1.1 for search, content, quizzes, grading and summaries.
+
+    Runs on asyncio with keep-alive connections. Deterministic GET responses
+    are kept encoded in an LRU and revalidated by ETag; ``POST /batch``
+    streams one NDJSON line per topic as soon as it is ready.
+
+        GET  /search?q=&limit=            GET /category?topic=
+        GET  /content?topic=&lang=        GET /summary?topic=
+        GET  /quiz?topic=&k=&seed=        POST /grade
+        POST /batch                       GET /health
+
+    Quizzes are served without their answers; clients grade by sending back
+    the topic and seed, and the keys are looked up here. Only the local CLI
+    batch mode emits answer keys.
+    """
+
+    def __init__(self, core=None, cache_entries=RESPONSE_CACHE_ENTRIES):
+        self.core = core or EduWiki()
+        self._cache = OrderedDict()
+        self._cache_entries = cache_entries
+        # Summaries can block on the network, so they run off the event loop
+        self._summaries = ThreadPoolExecutor(SUMMARY_WORKERS, thread_name_prefix='eduwiki-summary')
+        self._routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/search'): self.search,
+            ('GET', '/category'): self.category,
+            ('GET', '/content'): self.content,
+            ('GET', '/quiz'): self.quiz,
+            ('GET', '/summary'): self.summary,
+            ('POST', '/grade'): self.grade,
+            ('POST', '/batch'): self.batch,
+        }
+
+    # Handlers take (query, body) and return JSON-serializable data, or an
+    # async iterator of records to stream
+
+    async def health(self, query, body):
+        return {'status': 'ok', 'topics': len(self.core.catalog)}
+
+    async def search(self, query, body):
+        q = _param(query, 'q')
+        limit = _bounded(_int_param(query, 'limit', 20), 'limit', 1, MAX_SEARCH_LIMIT)
+        return {'query': q, 'results': self.core.search(q, limit)}
+
+    async def category(self, query, body):
+        topic = _param(query, 'topic')
+        return {'topic': topic, 'category': self.core.category(topic)}
+
+    async def content(self, query, body):
+        return self.core.content(_param(query, 'topic'), _language(_param(query, 'lang', DEFAULT_LANGUAGE)))
+
+    async def quiz(self, query, body):
+        # Without a seed one is drawn here and returned, so the quiz can still be graded
+        seed = _param(query, 'seed', str(random.getrandbits(32)))
+        return quiz_record(self.core, _param(query, 'topic'), seed, _int_param(query, 'k', QUIZ_LENGTH))
+
+    async def summary(self, query, body):
+        topic = _param(query, 'topic')
+        data = await asyncio.get_running_loop().run_in_executor(self._summaries, self.core.summary, topic)
+        return {'topic': topic, 'summary': _jsonable_summary(data)}
+
+    async def grade(self, query, body):
+        """Grade ``answers`` (one submission) or ``submissions`` (a list of them).
+
+        The quiz is named by ``topic``, ``seed`` and optionally ``k``, as
+        returned by /quiz, so answer keys never come from the client. A full
+        ``questions`` list is accepted instead for quizzes authored elsewhere.
+        """
+        if 'topic' in body:
+            topic = _field(body, 'topic', str)
+            seed = body.get('seed')
+            if not isinstance(seed, (str, int)) or isinstance(seed, bool):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'seed must be a string or integer')
+            k = _bounded(_field(body, 'k', int, QUIZ_LENGTH), 'k', 1, len(QUESTION_TEMPLATES))
+            questions = self.core.quiz(topic, k, random.Random(str(seed)))
+        else:
+            questions = _questions(_field(body, 'questions', list))
+        if 'submissions' in body:
+            submissions = [_answers(answers, len(questions)) for answers in _field(body, 'submissions', list)]
+            results = self.core.grade_many(questions, submissions)
+            return {'results': [{'score': score, 'total': total} for score, total in results]}
+        score, total = self.core.grade(questions, _answers(_field(body, 'answers', list), len(questions)))
+        return {'score': score, 'total': total}
+
+    def batch(self, query, body):
+        """{"topics": [...], "include": [...], "lang": "en"}: one streamed record per distinct topic, in order"""
+        topics = _field(body, 'topics', list)
+        if not all(isinstance(topic, str) for topic in topics):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'topics must be a list of strings')
+        # One record per distinct topic, as in the CLI batch mode
+        topics = list(dict.fromkeys(topics))
+        if len(topics) > MAX_BATCH:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"at most {MAX_BATCH} topics per batch")
+        include = _field(body, 'include', list, ['category', 'content'])
+        unknown = set(map(str, include)) - set(BATCH_FIELDS)
+        if unknown:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"unknown include: {', '.join(sorted(unknown))}")
+        return self._batch_records(topics, include, _language(body.get('lang', DEFAULT_LANGUAGE)))
+
+    async def _batch_records(self, topics, include, language):
+        loop = asyncio.get_running_loop()
+        # Start every summary fetch up front; records still go out in request order
+        pending = ([loop.run_in_executor(self._summaries, self.core.summary, topic) for topic in topics]
+                   if 'summary' in include else None)
+        for i, topic in enumerate(topics):
+            record = topic_record(self.core, topic, include, language)
+            if pending is not None:
+                record['summary'] = _jsonable_summary(await pending[i])
+            yield record
+
+    # HTTP plumbing
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, _error_body('malformed request line'), False)
+                    break
+                headers = await _read_headers(reader)
+                keep_alive = _keep_alive(version, headers)
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, _error_body('bad Content-Length'), False)
+                    break
+                if length > MAX_BODY:
+                    await self._send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, _error_body('body too large'), False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                await self.dispatch(writer, method, target, headers, body, version, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, writer, method, target, headers, body, version, keep_alive):
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            allowed = any(path == url.path for _, path in self._routes)
+            status = HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND
+            return await self._send(writer, status, _error_body(status.phrase), keep_alive)
+        query = parse_qs(url.query)
+        cacheable = method == 'GET' and url.path not in ('/summary', '/health') and \
+            (url.path != '/quiz' or 'seed' in query)
+        cached = self._cache_get(target) if cacheable else None
+        if cached is None:
+            try:
+                payload = json.loads(body) if body else {}
+                if not isinstance(payload, dict):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, 'body must be a JSON object')
+                result = handler(query, payload)
+                if hasattr(result, '__aiter__'):
+                    return await self._stream(writer, result, version)
+                result = await result
+            except HTTPError as exc:
+                return await self._send(writer, exc.status, _error_body(str(exc)), keep_alive)
+            except ValueError as exc:
+                return await self._send(writer, HTTPStatus.BAD_REQUEST, _error_body(str(exc)), keep_alive)
+            except Exception:
+                logging.getLogger(__name__).exception("%s %s failed", method, target)
+                status = HTTPStatus.INTERNAL_SERVER_ERROR
+                return await self._send(writer, status, _error_body(status.phrase), keep_alive)
+            data = _encode(result)
+            cached = (data, '"%08x"' % zlib.crc32(data))
+            if cacheable:
+                self._cache_put(target, cached)
+        data, etag = cached
+        extra = {'ETag': etag, 'Cache-Control': f"max-age={CACHE_MAX_AGE}"} if cacheable else {}
+        if cacheable and headers.get('if-none-match') == etag:
+            return await self._send(writer, HTTPStatus.NOT_MODIFIED, b'', keep_alive, extra)
+        await self._send(writer, HTTPStatus.OK, data, keep_alive, extra)
+
+    async def _send(self, writer, status, data, keep_alive, extra=None):
+        head = [f"HTTP/1.1 {status.value} {status.phrase}",
+                'Content-Type: application/json', f"Content-Length: {len(data)}",
+                'Connection: ' + ('keep-alive' if keep_alive else 'close')]
+        head += [f"{name}: {value}" for name, value in (extra or {}).items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+        await writer.drain()
+
+    async def _stream(self, writer, records, version):
+        """NDJSON, chunked on HTTP/1.1; HTTP/1.0 clients get a close-delimited body"""
+        chunked = version == 'HTTP/1.1'
+        head = ['HTTP/1.1 200 OK', 'Content-Type: application/x-ndjson']
+        head.append('Transfer-Encoding: chunked' if chunked else 'Connection: close')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        try:
+            async for record in records:
+                line = _encode(record) + b'\n'
+                writer.write(b'%x\r\n%s\r\n' % (len(line), line) if chunked else line)
+                await writer.drain()
+        except Exception as exc:
+            # Headers are gone; report the failure in-band as the last record
+            logging.getLogger(__name__).exception("Streaming response failed")
+            line = _encode({'error': str(exc)}) + b'\n'
+            writer.write(b'%x\r\n%s\r\n' % (len(line), line) if chunked else line)
+        if chunked:
+            writer.write(b'0\r\n\r\n')
+        await writer.drain()
+        if not chunked:
+            writer.close()
+
+    def _cache_get(self, key):
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+        return entry
+
+    def _cache_put(self, key, entry):
+        self._cache[key] = entry
+        while len(self._cache) > self._cache_entries:
+            self._cache.popitem(last=False)
+
+    async def serve(self, host=HOST, port=PORT):
+        # Build the catalog, index and stores before accepting connections;
+        # building them on first request would stall the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.core.warm)
+        server = await asyncio.start_server(self.handle, host, port, reuse_address=True)
+        print(f"EduWiki service on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def quiz_record(core, topic, seed, k=QUIZ_LENGTH, answers=False):
+    """A reproducible quiz: the same topic, seed and k always give the same questions"""
+    k = _bounded(k, 'k', 1, len(QUESTION_TEMPLATES))
+    questions = core.quiz(topic, k, random.Random(str(seed)))
+    if not answers:
+        questions = [{name: value for name, value in q.items() if name not in ('answer', 'key')} for q in questions]
+    return {'topic': topic, 'seed': str(seed), 'k': k, 'questions': questions}
+
+
+def topic_record(core, topic, include, language=DEFAULT_LANGUAGE, answers=False):
+    """Everything in ``include`` except summaries, which callers fetch concurrently"""
+    record = {'topic': topic}
+    if 'category' in include:
+        record['category'] = core.category(topic)
+    if 'content' in include:
+        record['content'] = core.content(topic, language)
+    if 'quiz' in include:
+        record['quiz'] = quiz_record(core, topic, random.getrandbits(32), answers=answers)
+    return record
+
+
+def _jsonable_summary(data):
+    if data is not None and isinstance(data.get('image'), bytes):
+        data = dict(data, image='data:application/octet-stream;base64,' + base64.b64encode(data['image']).decode())
+    return data
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _error_body(message):
+    return _encode({'error': message})
+
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    if values:
+        return values[0]
+    if default is None:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"missing parameter: {name}")
+    return default
+
+
+def _int_param(query, name, default):
+    try:
+        return int(_param(query, name, str(default)))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+
+
+def _bounded(value, name, low, high):
+    if not low <= value <= high:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be between {low} and {high}")
+    return value
+
+
+def _field(body, name, kind, default=None):
+    value = body.get(name, default)
+    # bool is an int subclass, but true is not a count
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be a {kind.__name__}")
+    return value
+
+
+def _language(language):
+    if language not in LANGUAGES:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"lang must be one of {', '.join(LANGUAGES)}")
+    return language
+
+
+def _questions(questions):
+    """Client-supplied questions, checked for everything grading reads"""
+    for q in questions:
+        if not (isinstance(q, dict) and isinstance(q.get('key'), str) and q.get('type') in QUESTION_TYPES
+                and isinstance(q.get('points'), int) and not isinstance(q['points'], bool)):
+            raise HTTPError(HTTPStatus.BAD_REQUEST,
+                            'each question needs a string key, an integer points and a type of mcq or fill')
+    return questions
+
+
+def _answers(answers, count):
+    """One submission: a string per question, unanswered ones as ''"""
+    if not isinstance(answers, list) or not all(isinstance(answer, str) for answer in answers):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'answers must be a list of strings')
+    if len(answers) != count:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"expected {count} answers, got {len(answers)}")
+    return answers
+
+
+async def _read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+def _keep_alive(version, headers):
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        return connection != 'close'
+    return connection == 'keep-alive'
+
+
+def run_batch(topics, include, language=DEFAULT_LANGUAGE, out=sys.stdout):
+    """CLI batch mode: one JSON line per topic on ``out``, in input order, quizzes with their answers"""
+    core = EduWiki()
+    topics = list(dict.fromkeys(topics))
+    with ThreadPoolExecutor(SUMMARY_WORKERS) as pool:
+        summaries = pool.map(core.summary, topics) if 'summary' in include else None
+        for topic in topics:
+            record = topic_record(core, topic, include, language, answers=True)
+            if summaries is not None:
+                record['summary'] = _jsonable_summary(next(summaries))
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    # python service.py serve [--host H] [--port P]
+    # python service.py batch [--include category,content,quiz,summary] [--lang L] < topics.txt
+    parser = argparse.ArgumentParser(description="EduWiki headless service")
+    parser.add_argument('mode', choices=['serve', 'batch'])
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--include', default='category,content')
+    parser.add_argument('--lang', default=DEFAULT_LANGUAGE)
+    args = parser.parse_args()
+    if args.mode == 'serve':
+        try:
+            asyncio.run(Service().serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        include = args.include.split(',')
+        unknown = set(include) - set(BATCH_FIELDS)
+        if unknown:
+            sys.exit(f"unknown --include: {', '.join(sorted(unknown))}")
+        if args.lang not in LANGUAGES:
+            sys.exit(f"--lang must be one of {', '.join(LANGUAGES)}")
+        run_batch((line.strip() for line in sys.stdin if line.strip()), include, args.lang)
@@ -0,0 +1,216 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from fetcher import default_fetcher
+from metrics import count
+
+WIKI_SUMMARY_URL = os.environ.get('EDUWIKI_WIKI_URL', "https://en.wikipedia.org/api/rest_v1/page/summary/")
+CACHE_PATH = os.environ.get(
+    'EDUWIKI_WIKI_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wiki_cache.sqlite3'))
+
+# Cache limits
+SUMMARY_TTL = 7 * 24 * 3600     # refresh summaries weekly
+MISSING_TTL = 24 * 3600         # retry 404 topics daily
+FAILURE_BACKOFF = 30            # first retry after a network error or 5xx...
+MAX_FAILURE_BACKOFF = 600       # ...doubling up to this
+MEMORY_ENTRIES = 512
+DISK_ENTRIES = 200000
+
+
+class WikiCache:
+    """Wikipedia summary cache: in-memory LRU in front of a SQLite file.
+
+    Failed fetches (network errors, 5xx) are remembered in memory only, apart
+    from the 404 negative entries, and put the topic into an exponential
+    backoff so an offline server doesn't retry upstream on every rerun.
+    """
+
+    def __init__(self, path=CACHE_PATH, memory_entries=MEMORY_ENTRIES, disk_entries=DISK_ENTRIES,
+                 ttl=SUMMARY_TTL, missing_ttl=MISSING_TTL, failure_backoff=FAILURE_BACKOFF):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.failure_backoff = failure_backoff
+        self._failures = {}
+        self._last_failure = float('-inf')
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS summaries ('
+            'topic TEXT PRIMARY KEY, data TEXT, etag TEXT, expires REAL NOT NULL, fetched REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS summaries_fetched ON summaries (fetched)')
+        self._db.commit()
+
+    def get(self, topic):
+        """Return (data, etag, expires) for a topic, or None if never cached.
+
+        ``data`` is None for topics Wikipedia reported as missing.
+        """
+        with self._lock:
+            entry = self._memory.get(topic)
+            if entry is not None:
+                self._memory.move_to_end(topic)
+                return entry
+            row = self._db.execute(
+                'SELECT data, etag, expires FROM summaries WHERE topic = ?', (topic,)).fetchone()
+            if row is None:
+                return None
+            entry = (json.loads(row[0]) if row[0] is not None else None, row[1], row[2])
+            self._remember(topic, entry)
+            return entry
+
+    def put(self, topic, data, etag=None):
+        """Store a summary, or a negative entry when ``data`` is None"""
+        now = time.time()
+        entry = (data, etag, now + (self.ttl if data is not None else self.missing_ttl))
+        with self._lock:
+            self._failures.pop(topic, None)
+            self._remember(topic, entry)
+            self._db.execute(
+                'INSERT OR REPLACE INTO summaries (topic, data, etag, expires, fetched) VALUES (?, ?, ?, ?, ?)',
+                (topic, json.dumps(data) if data is not None else None, etag, entry[2], now))
+            self._prune()
+            self._db.commit()
+
+    def touch(self, topic):
+        """Extend the lifetime of an entry that upstream confirmed unchanged"""
+        entry = self.get(topic)
+        if entry is not None:
+            self.put(topic, entry[0], entry[1])
+
+    def fail(self, topic):
+        """Record a failed fetch; each consecutive failure doubles the backoff"""
+        with self._lock:
+            _, backoff = self._failures.get(topic, (0, self.failure_backoff / 2))
+            backoff = min(backoff * 2, MAX_FAILURE_BACKOFF)
+            self._last_failure = time.monotonic()
+            self._failures[topic] = (self._last_failure + backoff, backoff)
+            while len(self._failures) > self.memory_entries:
+                self._failures.pop(next(iter(self._failures)))
+
+    def backing_off(self, topic):
+        """True while a recent failure says not to try upstream yet"""
+        failure = self._failures.get(topic)
+        return failure is not None and failure[0] > time.monotonic()
+
+    def recently_failed(self):
+        """True if any fetch failed within the base backoff, i.e. upstream looks unreachable"""
+        return time.monotonic() - self._last_failure < self.failure_backoff
+
+    def __contains__(self, topic):
+        entry = self.get(topic)
+        return entry is not None and entry[2] > time.time()
+
+    def _remember(self, topic, entry):
+        self._memory[topic] = entry
+        self._memory.move_to_end(topic)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self):
+        count = self._db.execute('SELECT COUNT(*) FROM summaries').fetchone()[0]
+        if count > self.disk_entries:
+            self._db.execute(
+                'DELETE FROM summaries WHERE topic IN (SELECT topic FROM summaries ORDER BY fetched LIMIT ?)',
+                (count - self.disk_entries,))
+
+
+def parse_summary(topic, data):
+    return {
+        'title': data.get('title', topic),
+        'summary': data.get('extract', 'No summary available'),
+        'url': data.get('content_urls', {}).get('desktop', {}).get('page', ''),
+        'image': data.get('thumbnail', {}).get('source', '') if data.get('thumbnail') else ''
+    }
+
+
+def get_wikipedia_summary(topic, cache=None, refresh=False, fetcher=None):
+    """Fetch Wikipedia summary for a topic, going through the cache when given.
+
+    Stale (or ``refresh``ed) entries are revalidated with If-None-Match and
+    still served when the network is unavailable. After a failed fetch the
+    topic is not retried until its backoff expires. Concurrent calls for the
+    same topic share one upstream request.
+    """
+    entry = cache.get(topic) if cache is not None else None
+    if entry is not None and entry[2] > time.time() and not refresh:
+        count('wiki.cache_hits')
+        return entry[0]
+    if cache is not None and not refresh and cache.backing_off(topic):
+        count('wiki.backoff_hits')
+        return entry[0] if entry is not None else None
+    count('wiki.cache_misses')
+    fetcher = fetcher or default_fetcher()
+    return fetcher.coalesce(topic, lambda: _fetch_summary(topic, cache, entry, fetcher))
+
+
+def get_wikipedia_summaries(topics, cache=None, fetcher=None):
+    """Fetch summaries for many topics in parallel; returns {topic: summary}"""
+    fetcher = fetcher or default_fetcher()
+    topics = list(dict.fromkeys(topics))
+    results = fetcher.map(lambda topic: get_wikipedia_summary(topic, cache, fetcher=fetcher), topics)
+    return dict(zip(topics, results))
+
+
+def _fetch_summary(topic, cache, entry, fetcher):
+    headers = {}
+    if entry is not None and entry[1]:
+        headers['If-None-Match'] = entry[1]
+    try:
+        response = fetcher.get(WIKI_SUMMARY_URL + topic.replace(" ", "_"), headers)
+        if response.status_code == 304 and entry is not None:
+            count('wiki.revalidated')
+            cache.touch(topic)
+            return entry[0]
+        if response.status_code == 200:
+            data = parse_summary(topic, response.json())
+            if cache is not None:
+                cache.put(topic, data, response.headers.get('ETag'))
+            return data
+        if response.status_code == 404:
+            if cache is not None:
+                cache.put(topic, None)
+            return None
+    except (requests.RequestException, ValueError):
+        count('wiki.fetch_errors')
+    if cache is not None:
+        cache.fail(topic)
+    return entry[0] if entry is not None else None
+
+
+def snapshot(topics, cache, force=False, fetcher=None):
+    """Prefill the cache for every topic; returns (fetched, missing, failed)"""
+    fetcher = fetcher or default_fetcher()
+    pending = [topic for topic in dict.fromkeys(topics) if force or topic not in cache]
+    results = fetcher.map(lambda topic: get_wikipedia_summary(topic, cache, refresh=force, fetcher=fetcher), pending)
+    fetched = missing = failed = 0
+    for topic, data in zip(pending, results):
+        if data is not None:
+            fetched += 1
+        elif topic in cache:
+            missing += 1
+        else:
+            failed += 1
+    return fetched, missing, failed
+
+
+if __name__ == '__main__':
+    # python wiki.py snapshot [--force]
+    if len(sys.argv) < 2 or sys.argv[1] != 'snapshot':
+        sys.exit("usage: python wiki.py snapshot [--force]")
+    from catalog import Catalog
+    catalog = Catalog.load()
+    fetched, missing, failed = snapshot(catalog.topics, WikiCache(), force='--force' in sys.argv)
+    print(f"{fetched} fetched, {missing} missing on Wikipedia, {failed} failed ({len(catalog)} topics)")